@@ -0,0 +1,151 @@
+"""Benchmark parsing the NinjaTrader ATI byte stream: per-field reads vs the incremental parser.
+
+Usage: python -m benchmarks.ati [messages | recording]
+
+A recording is a file with the raw bytes received from the ATI socket; without
+one a stream of VALUE updates and DATA ticks is generated. Either way the stream
+is replayed in 4096-byte receives.
+"""
+import datetime
+import os
+import sys
+import timeit
+
+from nt8.ati_socket import AtiParser
+from nt8.enums import MarketDataType, Message
+
+CHUNK = 4096
+
+
+def sample_stream(count: int) -> bytes:
+    start = datetime.datetime(2025, 3, 14, 9, 30)
+    fields = []
+    for i in range(count):
+        if i % 4 == 3:
+            fields += [Message.VALUE.value, f"OrderState|ORD{i // 4:06d}", "Working"]
+        else:
+            moment = start + datetime.timedelta(milliseconds=137 * i)
+            fields += [Message.DATA.value, MarketDataType.Last.value, "NQ 06-25",
+                       22400 + (i * 7919) % 200 / 4, 1 + i % 3, moment.strftime("%Y%m%d%H%M%S")]
+    return b"".join(str(field).encode("ascii") + b"\x00" for field in fields)
+
+
+class ReplaySocket:
+    def __init__(self, stream: bytes):
+        self.chunks = [stream[i:i + CHUNK] for i in range(0, len(stream), CHUNK)]
+        self.position = 0
+        self.offset = 0
+
+    def recv(self, size):
+        if self.position == len(self.chunks):
+            return b""
+        chunk = self.chunks[self.position]
+        self.position += 1
+        return chunk
+
+    def recv_into(self, view):
+        if self.position == len(self.chunks):
+            return 0
+        chunk = self.chunks[self.position]
+        count = min(len(view), len(chunk) - self.offset)
+        view[:count] = chunk[self.offset:self.offset + count]
+        self.offset += count
+        if self.offset == len(chunk):
+            self.position += 1
+            self.offset = 0
+        return count
+
+
+class LegacyReader:
+    """The previous AtiSocket reading: one find/del/decode per field, strptime per tick."""
+
+    def __init__(self, sock):
+        self.socket = sock
+        self.buffer = bytearray()
+
+    def read_string(self):
+        while True:
+            idx = self.buffer.find(b"\x00")
+            if idx != -1:
+                chunk = self.buffer[:idx]
+                del self.buffer[: idx + 1]
+                return chunk.decode("ascii")
+            data = self.socket.recv(CHUNK)
+            if not data:
+                raise EOFError
+            self.buffer.extend(data)
+
+    def read_integer(self):
+        return int(self.read_string())
+
+    def messages(self):
+        out = []
+        try:
+            while True:
+                msg_type = self.read_integer()
+                if msg_type == Message.COMMAND.value:
+                    out.append((msg_type, self.read_string()))
+                elif msg_type == Message.CONFIRMORDERS.value:
+                    out.append((msg_type, self.read_integer()))
+                elif msg_type == Message.DATA.value:
+                    data_type = MarketDataType(self.read_integer())
+                    instrument = self.read_string()
+                    price = float(self.read_string())
+                    size = self.read_integer()
+                    moment = datetime.datetime(1800, 1, 1)
+                    text = self.read_string()
+                    if text:
+                        try:
+                            moment = datetime.datetime.strptime(text, "%Y%m%d%H%M%S")
+                        except ValueError:
+                            pass
+                    out.append((msg_type, data_type, instrument, price, size, moment))
+                elif msg_type == Message.SUBSCRIBE.value:
+                    out.append((msg_type, self.read_string(), self.read_integer() != 0))
+                elif msg_type == Message.VALUE.value:
+                    out.append((msg_type, self.read_string(), self.read_string()))
+        except EOFError:
+            return out
+
+
+def legacy_parse(stream: bytes):
+    return LegacyReader(ReplaySocket(stream)).messages()
+
+
+def incremental_parse(stream: bytes, size: int = 65_536):
+    sock = ReplaySocket(stream)
+    parser = AtiParser(size)
+    out = []
+    while True:
+        count = sock.recv_into(parser.writable())
+        if not count:
+            return out
+        out += parser.feed(count)
+
+
+def report(name: str, seconds: float, count: int, size: int, baseline: float = None):
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"{name:<32} {seconds * 1e9 / count:>9.1f} ns/msg {size / seconds / 1e6:>8.1f} MB/s{speedup}")
+
+
+def main(source: str = "200000"):
+    if os.path.exists(source):
+        with open(source, "rb") as file:
+            stream = file.read()
+    else:
+        stream = sample_stream(int(source))
+
+    expected = legacy_parse(stream)
+    assert incremental_parse(stream) == expected
+    # A buffer smaller than a receive has to compact and grow
+    assert incremental_parse(stream, size=64) == expected
+    count = len(expected)
+
+    print(f"Parsing {count} ATI messages ({len(stream)} bytes, {CHUNK}-byte receives)")
+    base = timeit.timeit(lambda: legacy_parse(stream), number=1)
+    report("find/del per field (previous)", base, count, len(stream))
+    report("incremental parser", timeit.timeit(lambda: incremental_parse(stream), number=1), count, len(stream), base)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "200000")
@@ -0,0 +1,99 @@
+"""Benchmark sending ATI commands to a local mock NinjaTrader: one write per field vs per command vs batched.
+
+Usage: python -m benchmarks.ati_send [commands]
+"""
+import socket
+import sys
+import threading
+import time
+
+from nt8.ati_socket import AtiSocket
+
+FIELDS_PER_COMMAND = 2  # message type + the ';'-joined command string
+
+
+class MockServer:
+    """Accepts one ATI connection and counts the NUL-terminated fields it receives."""
+
+    def __init__(self):
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.address = self.listener.getsockname()
+        self.fields = 0
+        self.changed = threading.Condition()
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        conn, _ = self.listener.accept()
+        with conn:
+            while True:
+                data = conn.recv(65_536)
+                if not data:
+                    return
+                with self.changed:
+                    self.fields += data.count(b"\x00")
+                    self.changed.notify_all()
+
+    def wait_for(self, fields: int):
+        with self.changed:
+            self.changed.wait_for(lambda: self.fields >= fields, timeout=60)
+
+
+def sample_commands(count: int):
+    return [f"PLACE;Sim101;ES 06-25;BUY;2;LIMIT;{5600 + i % 40 * 0.25};0;GTC;;ORD{i:08d};ATM_10_10;" for i in range(count)]
+
+
+def connect():
+    server = MockServer()
+    sock = socket.create_connection(server.address)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return server, AtiSocket(sock, None, None, None, None, None)
+
+
+def run(commands, send, burst: int):
+    server, ati = connect()
+    started = time.perf_counter()
+    for start in range(0, len(commands), burst):
+        send(ati, commands[start:start + burst])
+    server.wait_for(len(commands) * FIELDS_PER_COMMAND)
+    seconds = time.perf_counter() - started
+    ati.Dispose()
+    assert server.fields == len(commands) * FIELDS_PER_COMMAND
+    return seconds
+
+
+def per_field(ati, burst):
+    # The previous NTClient.send_command: one send (lock + sendall) per field
+    for command in burst:
+        ati.send(0)
+        ati.send(command)
+
+
+def per_command(ati, burst):
+    for command in burst:
+        ati.send_message(0, command)
+
+
+def batched(ati, burst):
+    with ati.batch():
+        for command in burst:
+            ati.send_message(0, command)
+
+
+def report(name: str, seconds: float, count: int, baseline: float = None):
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"{name:<32} {count / seconds:>12,.0f} commands/s{speedup}")
+
+
+def main(count: int = 50_000):
+    commands = sample_commands(count)
+    for burst in (1, 20):
+        print(f"Sending {count} commands in bursts of {burst} to a local mock server")
+        base = run(commands, per_field, burst)
+        report("write per field (previous)", base, count)
+        report("write per command", run(commands, per_command, burst), count, base)
+        if burst > 1:
+            report("batch() per burst", run(commands, batched, burst), count, base)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,172 @@
+"""Compare pydantic schemas against the slotted engine records.
+
+Usage: python -m benchmarks.records [positions] [--backtest FILE INSTRUMENT POINT_A POINT_B]
+
+Runs `positions` pending -> open -> close lifecycles with both representations and
+reports throughput and retained memory. With --backtest, also runs a full scalar
+backtest over FILE twice, once with the engine building the pydantic schemas
+directly (as it did before the slotted records) and once with the records, and
+reports the time, peak traced memory and whether both produced the same trades.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from tickr.strategies.fibonacci.records import ClosedPositionRecord, OpenPositionRecord, PendingOrderRecord
+from tickr.strategies.fibonacci.schemas import PendingOrderInventory, PositionClose, PositionOpen
+
+
+def pydantic_lifecycle(index: int, tick: datetime):
+    pending = PendingOrderInventory(
+        orderId=str(index), instrument="NQ MAR25", orderType="BUY", price=20000.25, fibRatioLevel=0.618,
+        takeProfit=20015.25, stopLoss=19980.25, generatedAt=str(tick), systemTimeStamp=str(datetime.now()),
+    )
+    opened = PositionOpen(
+        instrument=pending.instrument, fibRatioLevel=pending.fibRatioLevel, positionType="LONG",
+        positionEntryPrice=pending.price, positionEntryTime=str(tick), systemTimeStamp=str(datetime.now()),
+        takeProfit=pending.takeProfit, stopLoss=pending.stopLoss,
+    )
+    return PositionClose(
+        metadata=opened, positionClosingPrice=20015.25, positionClosingTime=str(tick),
+        systemTimeStamp=str(datetime.now()), outcome="PROFIT", net=15.0,
+    )
+
+
+def record_lifecycle(index: int, tick: datetime):
+    pending = PendingOrderRecord(
+        orderId=str(index), instrument="NQ MAR25", orderType="BUY", price=20000.25, fibRatioLevel=0.618,
+        takeProfit=20015.25, stopLoss=19980.25, generatedAt=tick,
+    )
+    opened = OpenPositionRecord(
+        instrument=pending.instrument, fibRatioLevel=pending.fibRatioLevel, positionType="LONG",
+        positionEntryPrice=pending.price, positionEntryTime=tick,
+        takeProfit=pending.takeProfit, stopLoss=pending.stopLoss,
+    )
+    return ClosedPositionRecord(
+        metadata=opened, positionClosingPrice=20015.25, positionClosingTime=tick, outcome="PROFIT", net=15.0,
+    )
+
+
+def measure(name: str, lifecycle, count: int):
+    start = datetime(2025, 3, 14, 9, 30)
+    ticks = [start + timedelta(milliseconds=i) for i in range(count)]
+
+    started = time.perf_counter()
+    kept = [lifecycle(i, tick) for i, tick in enumerate(ticks)]
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    kept = [lifecycle(i, tick) for i, tick in enumerate(ticks)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {count / elapsed:>12,.0f} lifecycles/s {retained / count:>8.0f} B/position retained")
+    return kept
+
+
+class PydanticPending(PendingOrderInventory):
+    """Pending order built the way the engine did before the slotted records."""
+
+    def __init__(self, orderId, instrument, orderType, price, fibRatioLevel, takeProfit, stopLoss, generatedAt):
+        super().__init__(
+            orderId=orderId, instrument=instrument, orderType=orderType, price=price, fibRatioLevel=fibRatioLevel,
+            takeProfit=takeProfit, stopLoss=stopLoss, generatedAt=str(generatedAt), systemTimeStamp=str(datetime.now()),
+        )
+
+    def to_model(self):
+        return self
+
+
+class PydanticOpen(PositionOpen):
+    def __init__(self, instrument, fibRatioLevel, positionType, positionEntryPrice, positionEntryTime, takeProfit, stopLoss):
+        super().__init__(
+            instrument=instrument, fibRatioLevel=fibRatioLevel, positionType=positionType,
+            positionEntryPrice=positionEntryPrice, positionEntryTime=str(positionEntryTime),
+            systemTimeStamp=str(datetime.now()), takeProfit=takeProfit, stopLoss=stopLoss,
+        )
+
+    def to_model(self):
+        return self
+
+
+class PydanticClose(PositionClose):
+    def __init__(self, metadata, positionClosingPrice, positionClosingTime, outcome, net):
+        super().__init__(
+            metadata=metadata, positionClosingPrice=positionClosingPrice, positionClosingTime=str(positionClosingTime),
+            systemTimeStamp=str(datetime.now()), outcome=outcome, net=net,
+        )
+
+    def to_model(self):
+        return self
+
+
+@contextlib.contextmanager
+def engine_records(module, pending, opened, closed):
+    saved = module.PendingOrderRecord, module.OpenPositionRecord, module.ClosedPositionRecord
+    module.PendingOrderRecord, module.OpenPositionRecord, module.ClosedPositionRecord = pending, opened, closed
+    try:
+        yield
+    finally:
+        module.PendingOrderRecord, module.OpenPositionRecord, module.ClosedPositionRecord = saved
+
+
+def run_backtest(module, path: str, instrument: str, point_a: float, point_b: float, traced: bool = False):
+    """Seconds taken (or peak traced bytes when `traced`) and the closed trades."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot = module.FibonacciTradingBot(
+            point_a=point_a, point_b=point_b, instrument=instrument, quantity=1, take_profit=15, stop_loss=20,
+            reactivation_distance=10, nt_account="BENCH", price_stream_channel="BENCH",
+            fibonacci_ratios=[0, 0.23, 0.38, 0.50, 0.618, 0.78, 1.0, 1.23, 1.618, -0.23, -0.618, -1.14],
+            is_backtest=True,
+        )
+        if traced:
+            tracemalloc.start()
+        started = time.perf_counter()
+        bot.backtest(path)
+        measured = time.perf_counter() - started
+        if traced:
+            measured = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    trades = [(c.metadata.fibRatioLevel, c.metadata.positionType, c.metadata.positionEntryPrice, c.outcome, c.net)
+              for c in bot.closed_positions]
+    return measured, trades
+
+
+def compare_backtest(module, path: str, instrument: str, point_a: float, point_b: float, traced: bool):
+    with engine_records(module, PydanticPending, PydanticOpen, PydanticClose):
+        base, base_trades = run_backtest(module, path, instrument, point_a, point_b, traced)
+    result, trades = run_backtest(module, path, instrument, point_a, point_b, traced)
+    return base, result, trades == base_trades, len(trades)
+
+
+def backtest(path: str, instrument: str, point_a: float, point_b: float):
+    from tickr.core.hotlog import configure_logging
+    from tickr.strategies.fibonacci import run
+
+    configure_logging("ERROR")
+    with open(path, "rb") as file:
+        ticks = sum(1 for _ in file)
+    print(f"Scalar backtest over {os.path.basename(path)} ({ticks} ticks)")
+    # Timed without tracemalloc, which slows the engine down several times; memory in a second, traced pass
+    base, elapsed, same, trades = compare_backtest(run, path, instrument, point_a, point_b, traced=False)
+    base_peak, peak, _, _ = compare_backtest(run, path, instrument, point_a, point_b, traced=True)
+    for name, seconds, memory in (("pydantic", base, base_peak), ("records", elapsed, peak)):
+        print(f"{name:<10} {seconds:>7.2f}s {ticks / seconds:>12,.0f} ticks/s {memory / 2**20:>7.1f} MiB peak traced")
+    print(f"{trades} trades, x{base / elapsed:.2f} faster, {'same trades' if same else 'TRADES DIFFER'}")
+
+
+def main(argv):
+    count = int(argv[0]) if argv and not argv[0].startswith("--") else 100_000
+    print(f"{count} pending -> open -> close lifecycles")
+    measure("pydantic", pydantic_lifecycle, count)
+    measure("records", record_lifecycle, count)
+    if "--backtest" in argv:
+        path, instrument, point_a, point_b = argv[argv.index("--backtest") + 1: argv.index("--backtest") + 5]
+        backtest(path, instrument, float(point_a), float(point_b))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+"""Benchmark the fixed-width timestamp parsers against strptime.
+
+Usage: python -m benchmarks.timeparse [rows]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from tickr.core.timeparse import (
+    EXPORT_FORMAT,
+    STREAM_FORMAT,
+    parse_export_timestamp,
+    parse_export_timestamps,
+    parse_stream_timestamp,
+    parse_stream_timestamps,
+)
+
+
+def sample_stamps(rows: int):
+    start = datetime(2025, 3, 14, 9, 30)
+    moments = [start + timedelta(microseconds=137_531 * i) for i in range(rows)]
+    export = [m.strftime("%Y%m%d %H%M%S ") + f"{m.microsecond:06d}0" for m in moments]
+    stream = [m.strftime("%Y-%m-%d %H:%M:%S.%f") for m in moments]
+    return export, stream
+
+
+def report(name: str, seconds: float, rows: int, baseline: float = None):
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"{name:<32} {seconds * 1e9 / rows:>9.1f} ns/tick{speedup}")
+
+
+def main(rows: int = 200_000):
+    export, stream = sample_stamps(rows)
+
+    # Same results as the strptime paths they replace
+    assert [parse_export_timestamp(s) for s in export] == [datetime.strptime(s[:-1], EXPORT_FORMAT) for s in export]
+    assert [parse_stream_timestamp(s) for s in stream] == [datetime.strptime(s, STREAM_FORMAT) for s in stream]
+    bulk, valid = parse_export_timestamps(np.array(export))
+    assert valid.all() and bulk.tolist() == [parse_export_timestamp(s) for s in export]
+
+    print(f"Parsing {rows} timestamps")
+    base = timeit.timeit(lambda: [datetime.strptime(s[:-1], EXPORT_FORMAT) for s in export], number=1)
+    report("export strptime", base, rows)
+    report("export fixed-width", timeit.timeit(lambda: [parse_export_timestamp(s) for s in export], number=1), rows, base)
+    export_array = np.array(export)
+    report("export bulk datetime64", timeit.timeit(lambda: parse_export_timestamps(export_array), number=1), rows, base)
+
+    base = timeit.timeit(lambda: [datetime.strptime(s, STREAM_FORMAT) for s in stream], number=1)
+    report("stream strptime", base, rows)
+    report("stream fixed-width", timeit.timeit(lambda: [parse_stream_timestamp(s) for s in stream], number=1), rows, base)
+    stream_array = np.array(stream)
+    report("stream bulk datetime64", timeit.timeit(lambda: parse_stream_timestamps(stream_array), number=1), rows, base)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,53 @@
+"""Benchmark decoding price stream messages: legacy JSON vs binary frames.
+
+Usage: python -m benchmarks.wire [messages]
+"""
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from tickr.core.timeparse import STREAM_FORMAT
+from tickr.core.wire import decode_json, decode_price_message, decode_tick, encode_json, encode_tick
+
+TICKS_PER_POINT = 4
+
+
+def sample_messages(count: int):
+    start = datetime(2025, 3, 14, 9, 30)
+    ticks = [(start + timedelta(microseconds=137_531 * i), 22400 + (i * 7919) % 200) for i in range(count)]
+    as_json = [encode_json(tick / TICKS_PER_POINT, moment).encode() for moment, tick in ticks]
+    as_binary = [encode_tick(i, moment, tick, TICKS_PER_POINT) for i, (moment, tick) in enumerate(ticks)]
+    return ticks, as_json, as_binary
+
+
+def legacy_decode(data):
+    _data = json.loads(data)
+    return float(_data["LAST"]), datetime.strptime(_data["TIMESTAMP"], STREAM_FORMAT)
+
+
+def report(name: str, seconds: float, count: int, baseline: float = None):
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"{name:<32} {seconds * 1e9 / count:>9.1f} ns/msg{speedup}")
+
+
+def main(count: int = 200_000):
+    ticks, as_json, as_binary = sample_messages(count)
+
+    # Both formats decode to the same ticks
+    expected = [(tick / TICKS_PER_POINT, moment) for moment, tick in ticks]
+    assert [legacy_decode(m) for m in as_json] == expected
+    assert [decode_price_message(m) for m in as_json] == expected
+    assert [decode_price_message(m) for m in as_binary] == expected
+    assert [(f.timestamp, f.tick) for f in map(decode_tick, as_binary)] == ticks
+
+    print(f"Decoding {count} price messages (JSON {len(as_json[0])} bytes, binary {len(as_binary[0])} bytes)")
+    base = timeit.timeit(lambda: [legacy_decode(m) for m in as_json], number=1)
+    report("json + strptime (previous)", base, count)
+    report("json + fixed-width", timeit.timeit(lambda: [decode_json(m) for m in as_json], number=1), count, base)
+    report("binary frame", timeit.timeit(lambda: [decode_tick(m) for m in as_binary], number=1), count, base)
+    report("binary via auto-detect", timeit.timeit(lambda: [decode_price_message(m) for m in as_binary], number=1), count, base)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -1,9 +1,8 @@
 import uuid
 from datetime import datetime
-import time
 from enum import Enum
 
-from nt8.client import NTClient
+from nt8.client import FINAL_ORDER_STATUSES, NTClient
 from nt8.enums import OrderTypes, OrcaOrderStatus, ActionTypes
 from utilities.logger import config_logging
 
@@ -166,7 +165,9 @@ class Order:
             "",
         )
         logger.info(f"* Order {self.id} is Cancelled ********************")
-        time.sleep(0.1)
+        # Resend only if the cancel isn't confirmed within 0.1s
+        if ninja_trader_client.wait_order_status(self.id, FINAL_ORDER_STATUSES, timeout=0.1) is not None:
+            return
         ninja_trader_client.command(
             OrcaCommand.Cancel.value,
             account_name,
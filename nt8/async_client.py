@@ -0,0 +1,362 @@
+"""Asyncio NinjaTrader ATI client.
+
+`AsyncNTClient` has the command/query surface of `NTClient` but runs on the event
+loop instead of a reader thread: the socket is read by a buffered protocol that
+receives straight into an `AtiParser`, values and market data are delivered
+through futures and async iterators, and reconnects are scheduled on the loop. One
+event loop can then drive price ingestion, strategy and order routing without
+thread switches. Everything must be called from the loop the client connected on.
+"""
+import asyncio
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from nt8.ati_socket import AtiParser
+from nt8.client import DefaultHost, DefaultPort, FINAL_ORDER_STATUSES, MarketTick
+from nt8.enums import MarketDataType, Message
+from utilities.latency import LATENCY
+from utilities.logger import config_logging
+
+logger = config_logging(__name__)
+
+_DATA = Message.DATA.value
+_VALUE = Message.VALUE.value
+
+
+class _AtiProtocol(asyncio.BufferedProtocol):
+    def __init__(self, client: "AsyncNTClient"):
+        self.client = client
+        self.parser = AtiParser()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        return self.parser.writable()
+
+    def buffer_updated(self, nbytes):
+        try:
+            messages = self.parser.feed(nbytes)
+        except ValueError as e:
+            logger.error(f"Malformed ATI data: {e}")
+            self.client.connection_lost(self, e)
+            self.transport.close()
+            return
+        for message in messages:
+            self.client.dispatch(message)
+
+    def connection_lost(self, exc):
+        self.client.connection_lost(self, exc)
+
+
+class AsyncTickFeed:
+    """Async iterator over the ticks of one instrument; ends after `close()` or when the client closes.
+
+    When the consumer falls `maxsize` ticks behind, the oldest are dropped and counted.
+    """
+
+    def __init__(self, client: "AsyncNTClient", instrument: str, data_types, maxsize: int):
+        self.client = client
+        self.instrument = instrument
+        self.data_types = frozenset(data_types)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    def on_tick(self, tick: MarketTick) -> None:
+        if tick.data_type in self.data_types:
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(tick)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[MarketTick]:
+        """Next tick, or None after `timeout` seconds or once the feed is closed."""
+        if self.closed and self.queue.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> MarketTick:
+        tick = await self.get()
+        if tick is None:
+            raise StopAsyncIteration
+        return tick
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.client.remove_feed(self)
+            # The end-of-feed marker takes the place of the oldest tick when the queue is full
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(None)
+
+
+class AsyncNTClient:
+    def __init__(self, host: str = DefaultHost, port: int = DefaultPort, reconnect_delay: float = 10.0,
+                 tick_queue_size: int = 10_000):
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+        self.tick_queue_size = tick_queue_size
+        self.transport: Optional[asyncio.Transport] = None
+        self.protocol: Optional[_AtiProtocol] = None
+        self.values: Dict[str, str] = {}
+        # key -> [(predicate, future)] resolved when the value arrives
+        self.watchers = defaultdict(list)
+        # instrument -> feeds of its MarketTicks
+        self.feeds: Dict[str, List[AsyncTickFeed]] = defaultdict(list)
+        self._pending = bytearray()
+        # Latency stamps of the orders in `_pending`, closed when it is written
+        self._pending_stamps = []
+        self._flush_scheduled = False
+        self._closed = False
+        self._reconnect: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.transport is not None and not self.transport.is_closing()
+
+    async def connect(self, timeout: float = 10.0) -> None:
+        """Connect and wait for NinjaTrader's "ATI" handshake; raises ConnectionError if either fails."""
+        loop = asyncio.get_running_loop()
+        self._closed = False
+        # A reconnect must see a fresh handshake
+        self.values.pop("ATI", None)
+        try:
+            self.transport, self.protocol = await asyncio.wait_for(
+                loop.create_connection(lambda: _AtiProtocol(self), self.host, self.port), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ConnectionError(f"Unable to connect to server ({self.host}/{self.port}): {e}") from e
+        logger.info(f"Connected to {self.host}:{self.port}")
+        if await self.wait_for("ATI", timeout=timeout) is None:
+            self.disconnect()
+            raise ConnectionError("Timeout waiting for 'ATI' key from server.")
+
+    def disconnect(self) -> None:
+        """Drop the connection without scheduling a reconnect."""
+        transport = self.transport
+        self.transport = self.protocol = None
+        self._pending.clear()
+        self._pending_stamps.clear()
+        if transport is not None:
+            transport.close()
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        if self.transport is not None:
+            self._flush()
+            self.disconnect()
+        for feeds in list(self.feeds.values()):
+            for feed in list(feeds):
+                feed.close()
+
+    def connection_lost(self, protocol: _AtiProtocol, exc) -> None:
+        if protocol is not self.protocol:
+            return  # an earlier connection we already dropped
+        self.transport = self.protocol = None
+        self._pending.clear()
+        self._pending_stamps.clear()
+        if self._closed:
+            return
+        logger.error(f"NinjaTrader ATI connection lost: {exc}. Reconnecting in {self.reconnect_delay:g}s")
+        self._reconnect = asyncio.get_running_loop().call_later(
+            self.reconnect_delay, lambda: asyncio.ensure_future(self._reconnect_now()))
+
+    async def _reconnect_now(self) -> None:
+        self._reconnect = None
+        try:
+            await self.connect()
+        except ConnectionError as e:
+            logger.error(f"{e}. Reconnecting in {self.reconnect_delay:g}s")
+            self._reconnect = asyncio.get_running_loop().call_later(
+                self.reconnect_delay, lambda: asyncio.ensure_future(self._reconnect_now()))
+            return
+        # NinjaTrader forgets subscriptions with the connection
+        for instrument in self.feeds:
+            self.send_command(4, instrument, 1)
+
+    # Incoming
+
+    def dispatch(self, message) -> None:
+        msg_type = message[0]
+        if msg_type == _DATA:
+            _, data_type, instrument, price, size, time = message
+            feeds = self.feeds.get(instrument)
+            if feeds:
+                tick = MarketTick(instrument, data_type, price, size, time)
+                for feed in feeds:
+                    feed.on_tick(tick)
+        elif msg_type == _VALUE:
+            self.add_value(message[1], message[2])
+
+    def add_value(self, key: str, value: str) -> None:
+        self.values[key] = value
+        waiting = self.watchers.get(key)
+        if not waiting:
+            return
+        still_waiting = []
+        for predicate, future in waiting:
+            if future.done():
+                continue
+            if predicate(value):
+                future.set_result(value)
+            else:
+                still_waiting.append((predicate, future))
+        if still_waiting:
+            self.watchers[key] = still_waiting
+        else:
+            del self.watchers[key]
+
+    def watch(self, key: str, predicate: Callable[[str], bool] = bool) -> asyncio.Future:
+        """Future resolved with the value of `key` once `predicate(value)` holds (right away if it already does)."""
+        future = asyncio.get_running_loop().create_future()
+        value = self.values.get(key, "")
+        if predicate(value):
+            future.set_result(value)
+        else:
+            self.watchers[key].append((predicate, future))
+        return future
+
+    async def wait_for(self, key: str, predicate: Callable[[str], bool] = bool, timeout: Optional[float] = None) -> Optional[str]:
+        """Value of `key` once `predicate(value)` holds, or None after `timeout` seconds."""
+        future = self.watch(key, predicate)
+        if not future.done():
+            # The reply may depend on a command written later in this loop iteration
+            self._flush()
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            waiting = self.watchers.get(key)
+            if waiting:
+                waiting[:] = [watcher for watcher in waiting if watcher[1] is not future]
+                if not waiting:
+                    del self.watchers[key]
+            return None
+
+    async def wait_order_status(self, order_id: str, statuses: Iterable[str] = FINAL_ORDER_STATUSES,
+                                timeout: Optional[float] = None) -> Optional[str]:
+        statuses = frozenset(statuses)
+        return await self.wait_for(f"OrderStatus|{order_id}", statuses.__contains__, timeout)
+
+    async def wait_filled(self, order_id: str, timeout: Optional[float] = None) -> int:
+        value = await self.wait_for(f"Filled|{order_id}", lambda value: value not in ("", "0"), timeout)
+        return int(value) if value else 0
+
+    def tick_feed(self, instrument: str, data_types=(MarketDataType.Last,)) -> AsyncTickFeed:
+        """Subscribe to `instrument` and return an async iterator over its `data_types` updates (last trades by default)."""
+        feed = AsyncTickFeed(self, instrument, data_types, self.tick_queue_size)
+        feeds = self.feeds[instrument]
+        feeds.append(feed)
+        if len(feeds) == 1:
+            self.send_command(4, instrument, 1)
+        return feed
+
+    def remove_feed(self, feed: AsyncTickFeed) -> None:
+        feeds = self.feeds.get(feed.instrument)
+        if feeds and feed in feeds:
+            feeds.remove(feed)
+            if not feeds:
+                del self.feeds[feed.instrument]
+                self.unsubscribe_market_data(feed.instrument)
+
+    # Outgoing
+
+    def send_command(self, command, *args) -> int:
+        """Queue one message; everything sent in the same loop iteration goes out in one write."""
+        if not self.is_connected:
+            return -1
+        for field in (command, *args):
+            self._pending += str(field).encode("ascii")
+            self._pending += b"\x00"
+        stamps = LATENCY.order_queued()
+        if stamps:
+            self._pending_stamps.append(stamps)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return 0
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if self._pending and self.is_connected:
+            self.transport.write(bytes(self._pending))
+            for stamps in self._pending_stamps:
+                LATENCY.order_written(stamps)
+        self._pending.clear()
+        self._pending_stamps.clear()
+
+    def command(self, command, account, instrument, order_id, oco="", action="", quantity=0, order_type="",
+                limit_price=0, stop_price=0, time_in_force="", tpl="", strategy=""):
+        cmd_string = f"{command};{account};{instrument};{action};{quantity};{order_type};{limit_price};{stop_price};{time_in_force};{oco};{order_id};{tpl};{strategy}"
+        return self.send_command(0, cmd_string)
+
+    def confirm_orders(self, confirm):
+        return self.send_command(3, confirm)
+
+    def subscribe_market_data(self, instrument):
+        if self.get_last_price(instrument) == 0:
+            logger.debug(f"Subscribe for {instrument}")
+            return self.send_command(4, instrument, 1)
+        logger.debug(f"Already subscribe for {instrument}")
+
+    def unsubscribe_market_data(self, instrument):
+        return self.send_command(4, instrument, 0)
+
+    def new_order_id(self):
+        return uuid.uuid4().hex.upper()
+
+    # Latest values, as NTClient returns them
+
+    def get_string(self, key):
+        return self.values.get(key, "")
+
+    def get_double(self, key):
+        value = self.get_string(key)
+        try:
+            return float(value) if value else 0.0
+        except ValueError:
+            return 0.0
+
+    def get_int(self, key):
+        value = self.get_string(key)
+        try:
+            return int(value) if value else 0
+        except ValueError:
+            return 0
+
+    def connected(self) -> bool:
+        return self.is_connected and self.get_string("ATI") == "True"
+
+    def order_status(self, order_id: str) -> str:
+        return self.get_string(f"OrderStatus|{order_id}")
+
+    def filled(self, order_id: str) -> int:
+        return self.get_int(f"Filled|{order_id}")
+
+    def market_position(self, instrument_name, account_name):
+        return self.get_int(f"MarketPosition|{instrument_name}|{account_name}")
+
+    def market_data(self, instrument, type_):
+        return self.get_double(f"MarketData|{instrument}|{type_.value}")
+
+    def get_last_price(self, instrument_name):
+        return self.market_data(instrument_name, MarketDataType.Last)
+
+    def buying_power(self, account_name: str):
+        return self.get_double(f"BuyingPower|{account_name}")
+
+    def cash_value(self, account_name: str):
+        return self.get_double(f"CashValue|{account_name}")
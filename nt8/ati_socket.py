@@ -1,11 +1,130 @@
+import contextlib
 import datetime
 import socket
 import threading
+import time
+from typing import Callable, Optional
 from nt8.enums import MarketDataType, Message
 from utilities.logger import config_logging
 
 logger = config_logging(__name__)
 
+_COMMAND = Message.COMMAND.value
+_DATA = Message.DATA.value
+_VALUE = Message.VALUE.value
+_CONFIRMORDERS = Message.CONFIRMORDERS.value
+_SUBSCRIBE = Message.SUBSCRIBE.value
+
+# Number of fields following the message type
+_FIELD_COUNTS = {_COMMAND: 1, _DATA: 5, _VALUE: 2, _CONFIRMORDERS: 1, _SUBSCRIBE: 2}
+_DATA_TYPES = {data_type.value: data_type for data_type in MarketDataType}
+_NO_TIME = datetime.datetime(1800, 1, 1)
+
+
+class AtiParser:
+    """Incremental parser for the ATI stream.
+
+    Every field is NUL-terminated ASCII; a message is its type followed by a fixed
+    number of fields. Bytes are received straight into a fixed buffer
+    (`recv_into(parser.writable())`) and `feed()` decodes every complete message
+    in one pass: the complete part of the unread bytes is decoded and split once,
+    and a read offset is advanced instead of deleting consumed bytes. The unread
+    tail is only moved to the front when free space at the end runs low.
+
+    A field that isn't a known message type, or starts a message that doesn't
+    decode, is logged and skipped: parsing resumes at the next field.
+
+    Messages are tuples: (COMMAND, text), (DATA, MarketDataType, instrument, price,
+    size, time), (VALUE, key, value), (CONFIRMORDERS, int), (SUBSCRIBE, instrument, bool).
+    """
+
+    def __init__(self, size: int = 65_536):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # first unread byte
+        self.end = 0    # end of received bytes
+        self._last_stamp = None
+        self._last_time = _NO_TIME
+
+    def writable(self) -> memoryview:
+        """Free space at the end of the buffer, compacting or growing it first if needed."""
+        size = len(self.buffer)
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif size - self.end <= size // 4:
+            unread = bytes(self.view[self.start:self.end])
+            if len(unread) > size // 2:
+                # A message larger than the buffer can hold: grow it
+                self.view.release()
+                self.buffer = bytearray(size * 2)
+                self.view = memoryview(self.buffer)
+            self.buffer[:len(unread)] = unread
+            self.start, self.end = 0, len(unread)
+        return self.view[self.end:]
+
+    def feed(self, count: int) -> list:
+        """Account for `count` bytes received into `writable()` and return the complete messages."""
+        self.end += count
+        return self.parse()
+
+    def parse(self) -> list:
+        last = self.buffer.rfind(b"\x00", self.start, self.end)
+        if last < 0:
+            return []
+        fields = str(self.view[self.start:last], "ascii").split("\x00")
+        total = len(fields)
+        messages = []
+        append = messages.append
+        i = 0
+        while i < total:
+            msg_type = int(fields[i]) if fields[i].isdigit() else None
+            count = _FIELD_COUNTS.get(msg_type)
+            if count is None:
+                # Resynchronise on the next field instead of dropping the connection
+                logger.error(f"Skipping unknown ATI message type {fields[i]!r}")
+                i += 1
+                continue
+            if i + count >= total:
+                break  # the rest of this message hasn't arrived yet
+            try:
+                if msg_type == _DATA:
+                    append((_DATA, _DATA_TYPES[int(fields[i + 1])], fields[i + 2], float(fields[i + 3]),
+                            int(fields[i + 4]), self.parse_time(fields[i + 5])))
+                elif msg_type == _VALUE:
+                    append((_VALUE, fields[i + 1], fields[i + 2]))
+                elif msg_type == _COMMAND:
+                    append((_COMMAND, fields[i + 1]))
+                elif msg_type == _CONFIRMORDERS:
+                    append((_CONFIRMORDERS, int(fields[i + 1])))
+                else:
+                    append((_SUBSCRIBE, fields[i + 1], int(fields[i + 2]) != 0))
+            except (ValueError, KeyError):
+                logger.error(f"Skipping malformed ATI message {fields[i:i + count + 1]!r}")
+                i += 1
+                continue
+            i += count + 1
+
+        if i == total:
+            self.start = last + 1
+        else:
+            # ASCII: one byte per character, plus one NUL per field
+            self.start += sum(map(len, fields[:i])) + i
+        return messages
+
+    def parse_time(self, text: str) -> datetime.datetime:
+        """'%Y%m%d%H%M%S' (1800-01-01 when empty or invalid); consecutive ticks usually share the second."""
+        if text == self._last_stamp:
+            return self._last_time
+        moment = _NO_TIME
+        if len(text) == 14 and text.isdigit():
+            try:
+                moment = datetime.datetime(int(text[0:4]), int(text[4:6]), int(text[6:8]),
+                                           int(text[8:10]), int(text[10:12]), int(text[12:14]))
+            except ValueError:
+                pass
+        self._last_stamp, self._last_time = text, moment
+        return moment
+
 
 class AtiSocket:
 
@@ -17,6 +136,7 @@ class AtiSocket:
         dataHandler,
         subscribeHandler,
         valueHandler,
+        flush_delay: float = 0.001,
     ):
         self.commandHandler = commandHandler
         self.confirmOrdersHandler = confirmOrdersHandler
@@ -24,8 +144,18 @@ class AtiSocket:
         self.subscribeHandler = subscribeHandler
         self.valueHandler = valueHandler
         self.socket = sock
-        self.lock = threading.Lock()
-        self.buffer = bytearray()
+        # Reentrant: a failed sendall disposes the socket while holding it
+        self.lock = threading.RLock()
+        self.parser = AtiParser()
+        # Outgoing messages coalesced by batch(), flushed at the latest `flush_delay` seconds after the first one
+        self.flush_delay = flush_delay
+        self.pending = bytearray()
+        # Callbacks of the queued messages, run once they are written
+        self.pending_written = []
+        self.pending_deadline = 0.0
+        self.batch_depth = 0
+        self.pending_ready = threading.Condition(self.lock)
+        self.flusher = None
         self.thread = threading.Thread(
             target=self.loop, name="NT AtiSocket", daemon=True
         )
@@ -45,90 +175,133 @@ class AtiSocket:
                     pass
                 self.socket.close()
                 self.socket = None
+                self.pending.clear()
+                self.pending_written.clear()
+                self.pending_ready.notify_all()
 
     def loop(self):
-        # with self.lock:
+        parser = self.parser
         try:
             while True:
-                # sleep(2)
-                # msg_type = self.ReadInteger()
-                msg_type = self.read_integer()
-                # print(f"Received message type: {msg_type}")
-                if msg_type == Message.COMMAND.value:
-                    obj2 = self.read_string()
-                    if self.commandHandler:
-                        self.commandHandler(obj2)
-                elif msg_type == Message.CONFIRMORDERS.value:
-                    obj = self.read_integer()
-                    if self.confirmOrdersHandler:
-                        self.confirmOrdersHandler(obj)
-                elif msg_type == Message.DATA.value:
-                    arg4 = MarketDataType(self.read_integer())
-                    arg5 = self.read_string()
-                    arg6 = self.read_double()
-                    arg7 = self.read_integer()
-                    arg8 = datetime.datetime(1800, 1, 1)
-                    text = self.read_string()
-                    if text:
-                        try:
-                            arg8 = datetime.datetime.strptime(text, "%Y%m%d%H%M%S")
-                        except ValueError:
-                            pass
-                    if self.dataHandler:
-                        self.dataHandler(arg5, arg4, arg6, arg7, arg8)
-                elif msg_type == Message.SUBSCRIBE.value:
-                    arg3 = self.read_string()
-                    num = self.read_integer()
-                    if self.subscribeHandler:
-                        self.subscribeHandler(arg3, num != 0)
-                elif msg_type == Message.VALUE.value:
-                    arg = self.read_string()
-                    arg2 = self.read_string()
-                    if self.valueHandler:
-                        self.valueHandler(arg, arg2)
-        except Exception as e:
-            logger.error(f"Exception in AtiSocket Loop: {e}")
-            self.Dispose()
-
-    def read_double(self):
-        return float(self.read_string())
-
-    def read_integer(self):
-        return int(self.read_string())
-
-    def read_string(self):
-        while True:
-            idx = self.buffer.find(b"\x00")
-            if idx != -1:
-                chunk = self.buffer[:idx]
-                del self.buffer[: idx + 1]
-                result = chunk.decode("ascii")
-                # print(f"ReadString: {result}")
-                return result
-            else:
                 try:
-                    data = self.socket.recv(4096)
-                    # print(f"Received data: {data}")
+                    count = self.socket.recv_into(parser.writable())
                 except Exception as e:
-                    logger.error(f"Exception in ReadString: {e}")
-                    self.Dispose()
+                    logger.error(f"Exception in AtiSocket recv: {e}")
                     raise
-                if not data:
+                if not count:
                     logger.error("No data received, socket may be closed.")
-                    self.Dispose()
                     raise Exception("Socket closed")
-                self.buffer.extend(data)
+                for message in parser.feed(count):
+                    self.dispatch(message)
+        except Exception as e:
+            logger.error(f"Exception in AtiSocket Loop: {e}")
+            self.Dispose()
+
+    def dispatch(self, message):
+        msg_type = message[0]
+        if msg_type == _DATA:
+            if self.dataHandler:
+                _, data_type, instrument, price, size, time = message
+                self.dataHandler(instrument, data_type, price, size, time)
+        elif msg_type == _VALUE:
+            if self.valueHandler:
+                self.valueHandler(message[1], message[2])
+        elif msg_type == _COMMAND:
+            if self.commandHandler:
+                self.commandHandler(message[1])
+        elif msg_type == _CONFIRMORDERS:
+            if self.confirmOrdersHandler:
+                self.confirmOrdersHandler(message[1])
+        elif msg_type == _SUBSCRIBE:
+            if self.subscribeHandler:
+                self.subscribeHandler(message[1], message[2])
 
     def send(self, val):
-        if self.socket is None:
-            return
+        self.send_message(val)
+
+    def send_message(self, *fields, on_written: Optional[Callable[[], None]] = None):
+        """Send one message (its fields NUL-terminated) with a single write, or queue it while batching.
+
+        `on_written` is called once the message has actually been written to the socket.
+        """
+        data = b"".join(str(field).encode("ascii") + b"\x00" for field in fields)
         with self.lock:
-            if isinstance(val, (int, float)):
-                buf = str(val)
-            else:
-                buf = val
-            data = buf.encode("ascii") + b"\x00"
+            if self.socket is None:
+                return
+            if self.batch_depth:
+                if not self.pending:
+                    self.pending_deadline = time.monotonic() + self.flush_delay
+                    self.pending_ready.notify()
+                self.pending += data
+                if on_written is not None:
+                    self.pending_written.append(on_written)
+                if len(self.pending) >= 65_536:
+                    self._flush()
+                return
+            if self.pending:
+                # Keep the order: anything a batch left behind goes first
+                self.pending += data
+                if on_written is not None:
+                    self.pending_written.append(on_written)
+                self._flush()
+                return
             try:
                 self.socket.sendall(data)
             except Exception:
                 self.Dispose()
+                return
+            if on_written is not None:
+                on_written()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Coalesce the messages sent inside the block into as few writes as possible.
+
+        Everything is written when the outermost batch exits, or by a background
+        flush once the first queued message is `flush_delay` seconds old.
+        Batches may nest and span threads; message order is kept.
+        """
+        with self.lock:
+            self.batch_depth += 1
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self._flush_loop, name="NT AtiSocket flush", daemon=True)
+                self.flusher.start()
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if not self.batch_depth:
+                    self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        # Called with the lock held
+        if not self.pending or self.socket is None:
+            return
+        data = bytes(self.pending)
+        written = self.pending_written
+        self.pending.clear()
+        self.pending_written = []
+        try:
+            self.socket.sendall(data)
+        except Exception:
+            self.Dispose()
+            return
+        for callback in written:
+            callback()
+
+    def _flush_loop(self):
+        with self.lock:
+            while self.socket is not None:
+                if not self.pending:
+                    self.pending_ready.wait()
+                    continue
+                remaining = self.pending_deadline - time.monotonic()
+                if remaining > 0:
+                    self.pending_ready.wait(remaining)
+                    continue
+                self._flush()
@@ -1,11 +1,16 @@
+import concurrent.futures
+import contextlib
+import datetime
+import queue
 import socket
 import threading
-import time
 import uuid
 from collections import defaultdict
+from typing import Callable, Iterable, NamedTuple, Optional
 
 from nt8.ati_socket import AtiSocket
 from nt8.enums import MarketDataType
+from utilities.latency import LATENCY
 from utilities.logger import config_logging
 
 logger = config_logging(__name__)
@@ -13,6 +18,67 @@ logger = config_logging(__name__)
 DefaultHost = "127.0.0.1"
 DefaultPort = 36973
 
+# Order states after which NinjaTrader won't act on the order anymore
+FINAL_ORDER_STATUSES = frozenset(("Cancelled", "Filled", "Rejected", "Expired"))
+
+
+def is_flat(position: str) -> bool:
+    """True if a MarketPosition value reports no position; "" only means it hasn't arrived yet."""
+    return position in ("0", "Flat")
+
+
+class MarketTick(NamedTuple):
+    """One market data update from a DATA message on the ATI socket."""
+    instrument: str
+    data_type: MarketDataType
+    price: float
+    size: int
+    time: datetime.datetime  # second resolution; 1800-01-01 when NinjaTrader sends none
+
+
+class TickFeed:
+    """Iterator over the ticks of one instrument, filled from the ATI socket thread.
+
+    Iteration blocks until the next tick arrives and ends after `close()`.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, client: "NTClient", instrument: str, data_types):
+        self.client = client
+        self.instrument = instrument
+        self.data_types = frozenset(data_types)
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.closed = False
+
+    def on_tick(self, tick: MarketTick) -> None:
+        if tick.data_type in self.data_types:
+            self.queue.put(tick)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[MarketTick]:
+        """Next tick, or None after `timeout` seconds or once the feed is closed."""
+        try:
+            tick = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if tick is TickFeed._CLOSED:
+            self.queue.put(tick)  # keep later calls from blocking
+            return None
+        return tick
+
+    def __iter__(self):
+        while True:
+            tick = self.get()
+            if tick is None:
+                return
+            yield tick
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.client.unsubscribe_ticks(self.instrument, self.on_tick)
+            self.queue.put(TickFeed._CLOSED)
+
 
 class NTClient:
     def __init__(self):
@@ -24,11 +90,116 @@ class NTClient:
         self.timer = None
         self.values = defaultdict(str)
         self.lock = threading.Lock()
+        # key -> [(predicate, future)] resolved by add_value
+        self.watchers = defaultdict(list)
+        # instrument -> tick callbacks fed by add_data
+        self.tick_handlers = defaultdict(list)
 
     def add_value(self, key, value):
-        # print(f"AddValue called with key: {key}, value: {value}")
         with self.lock:
             self.values[key] = value
+            waiting = self.watchers.get(key)
+            if not waiting:
+                return
+            ready, still_waiting = [], []
+            for watcher in waiting:
+                (ready if watcher[0](value) else still_waiting).append(watcher)
+            if still_waiting:
+                self.watchers[key] = still_waiting
+            else:
+                del self.watchers[key]
+        for _, future in ready:
+            if future.set_running_or_notify_cancel():
+                future.set_result(value)
+
+    def add_data(self, instrument, data_type, price, size, time):
+        handlers = self.tick_handlers.get(instrument)
+        if handlers:
+            tick = MarketTick(instrument, data_type, price, size, time)
+            for handler in handlers:
+                handler(tick)
+
+    def subscribe_ticks(self, instrument: str, callback: Callable[[MarketTick], None]) -> int:
+        """Call `callback(MarketTick)` on the ATI socket thread for every market data update of `instrument`.
+
+        Callbacks must return quickly; use `tick_feed()` to consume ticks on another thread.
+        """
+        with self.lock:
+            # Copy on write: add_data iterates the list without taking the lock
+            handlers = self.tick_handlers.get(instrument, [])
+            self.tick_handlers[instrument] = handlers + [callback]
+            first = not handlers
+        if first:
+            return self.send_command(4, instrument, 1)
+        return 0
+
+    def unsubscribe_ticks(self, instrument: str, callback: Callable[[MarketTick], None]) -> None:
+        with self.lock:
+            handlers = [handler for handler in self.tick_handlers.get(instrument, []) if handler != callback]
+            if handlers:
+                self.tick_handlers[instrument] = handlers
+            else:
+                self.tick_handlers.pop(instrument, None)
+        if not handlers and self.socket is not None and self.socket.is_connected:
+            self.unsubscribe_market_data(instrument)
+
+    def tick_feed(self, instrument: str, data_types=(MarketDataType.Last,)) -> TickFeed:
+        """Subscribe to `instrument` and return an iterator over its `data_types` updates (last trades by default)."""
+        feed = TickFeed(self, instrument, data_types)
+        self.subscribe_ticks(instrument, feed.on_tick)
+        return feed
+
+    def watch(self, key: str, predicate: Callable[[str], bool] = bool) -> concurrent.futures.Future:
+        """Future resolved with the value of `key` once `predicate(value)` holds (right away if it already does).
+
+        Attach callbacks with `add_done_callback`; cancel the future to stop watching.
+        """
+        future = concurrent.futures.Future()
+        with self.lock:
+            value = self.values.get(key, "")
+            if not predicate(value):
+                self.watchers[key].append((predicate, future))
+                return future
+        future.set_running_or_notify_cancel()
+        future.set_result(value)
+        return future
+
+    def wait_for(self, key: str, predicate: Callable[[str], bool] = bool, timeout: Optional[float] = None) -> Optional[str]:
+        """Block until `predicate(value)` holds for `key` and return the value, or None after `timeout` seconds."""
+        future = self.watch(key, predicate)
+        if not future.done() and self.socket is not None:
+            # The reply may depend on a command still queued by a batch
+            self.socket.flush()
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.unwatch(key, future)
+            return None
+
+    def batch(self):
+        """Context manager coalescing the commands sent inside it into one write (see `AtiSocket.batch`)."""
+        if self.socket is not None and self.socket.is_connected:
+            return self.socket.batch()
+        return contextlib.nullcontext()
+
+    def unwatch(self, key: str, future: concurrent.futures.Future) -> None:
+        with self.lock:
+            waiting = self.watchers.get(key)
+            if waiting:
+                waiting[:] = [watcher for watcher in waiting if watcher[1] is not future]
+                if not waiting:
+                    del self.watchers[key]
+
+    def wait_order_status(self, order_id: str, statuses: Iterable[str], timeout: Optional[float] = None) -> Optional[str]:
+        """Wait until the order reaches one of `statuses`; returns it, or None on timeout."""
+        statuses = frozenset(statuses)
+        return self.wait_for(f"OrderStatus|{order_id}", statuses.__contains__, timeout)
+
+    def wait_filled(self, order_id: str, timeout: Optional[float] = None) -> int:
+        """Wait for a fill on the order and return the filled quantity (0 on timeout)."""
+        value = self.wait_for(f"Filled|{order_id}", lambda value: value not in ("", "0"), timeout)
+        return int(value) if value else 0
 
     def set_up(self, show_message=True):
         if not self.had_error:
@@ -45,16 +216,10 @@ class NTClient:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.connect((self.host, self.port))
             logger.info(f"Connected to {self.host}:{self.port}")
-            self.socket = AtiSocket(sock, None, None, None, None, self.add_value)
-
-            # Wait for the "ATI" key to be set
-            # Wait for the "ATI" key to be set
-            for _ in range(1000):
-                if self.get_string("ATI"):
-                    # print("Received 'ATI' key from server.")
-                    break
-                threading.Event().wait(0.01)
-            else:
+            self.socket = AtiSocket(sock, None, None, self.add_data, None, self.add_value)
+
+            # NinjaTrader sets the "ATI" key once it is ready
+            if self.wait_for("ATI", timeout=10.0) is None:
                 logger.info("Timeout waiting for 'ATI' key from server.")
 
         except Exception as ex:
@@ -115,9 +280,8 @@ class NTClient:
     def send_command(self, command, *args):
         if self.set_up(True) != 0:
             return -1
-        self.socket.send(command)
-        for arg in args:
-            self.socket.send(arg)
+        stamps = LATENCY.order_queued()
+        self.socket.send_message(command, *args, on_written=stamps and (lambda: LATENCY.order_written(stamps)))
         return 0
 
     def ask(self, instrument, price, size):
@@ -457,8 +621,10 @@ class NTClient:
         try:
             # Close all positions for the specified account and instrument.
             self.close_all_positions(account_name, instrument_name)
-            time.sleep(0.5)
-            self.close_all_positions(account_name, instrument_name)
+            # Close again unless NinjaTrader reports the position flat within 0.5s
+            position_key = f"MarketPosition|{instrument_name}|{account_name}"
+            if self.wait_for(position_key, is_flat, timeout=0.5) is None:
+                self.close_all_positions(account_name, instrument_name)
 
             # Cancel all orders for the specified account (no instrument).
             self.cancel_all_orders(account_name)
@@ -516,9 +682,19 @@ class NTClient:
         # Retrieve all placed orders for the specified account and instrument.
         all_placed_orders = self.orders(account_name, 500)
 
-        # Iterate through the list of orders and cancel each one asynchronously.
-        for order_id in all_placed_orders:
-            self.cancel_order_adv(account_name, instrument_name, order_id)
+        # Send every cancel in one write, then resend (again in one write) the ones
+        # NinjaTrader hasn't confirmed within 0.1s
+        with self.batch():
+            for order_id in all_placed_orders:
+                self.send_cancel(account_name, instrument_name, order_id)
+        confirmations = {order_id: self.watch(f"OrderStatus|{order_id}", FINAL_ORDER_STATUSES.__contains__)
+                         for order_id in all_placed_orders}
+        concurrent.futures.wait(confirmations.values(), timeout=0.1)
+        with self.batch():
+            for order_id, future in confirmations.items():
+                if not future.done():
+                    self.unwatch(f"OrderStatus|{order_id}", future)
+                    self.send_cancel(account_name, instrument_name, order_id)
 
     def cancel_all_orders(self, account_name: str):
         """
@@ -544,6 +720,13 @@ class NTClient:
         """
         Cancel a specific order for a specified account and instrument.
         """
+        self.send_cancel(account_name, instrument_name, order_id)
+        # Resend only if the cancel isn't confirmed within 0.1s
+        if self.wait_order_status(order_id, FINAL_ORDER_STATUSES, timeout=0.1) is not None:
+            return
+        self.send_cancel(account_name, instrument_name, order_id)
+
+    def send_cancel(self, account_name: str, instrument_name: str, order_id: str):
         # Send the command to cancel the specified order.
         self.command(
             "CANCEL",
@@ -561,20 +744,3 @@ class NTClient:
             "",
         )
         logger.info(f"* Order {order_id} is Cancelled ********************")
-        time.sleep(0.1)
-        self.command(
-            "CANCEL",
-            account_name,
-            instrument_name,
-            "",
-            0,
-            "",
-            0,
-            0,
-            "GTC",
-            "",
-            order_id,
-            "",
-            "",
-        )
-        logger.info(f"* Order {order_id} is Cancelled ********************")
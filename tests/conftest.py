@@ -0,0 +1,6 @@
+from tickr.core.hotlog import configure_logging
+
+
+def pytest_configure(config):
+    # Bots no longer set up logging themselves; keep the tick path quiet like the CLI's --logging-level ERROR
+    configure_logging("ERROR")
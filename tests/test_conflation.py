@@ -0,0 +1,64 @@
+"""Conflated bursts must trade exactly like the same ticks processed one by one."""
+import random
+from datetime import datetime, time, timedelta
+
+from tickr.core.wire import encode_json
+from tickr.strategies.fibonacci.config import TradingSchedule
+from tickr.strategies.fibonacci.run import FibonacciTradingBot
+
+START = datetime(2025, 3, 12, 10, 0)
+
+
+def make_bot():
+    bot = FibonacciTradingBot(
+        point_a=20100, point_b=20000, instrument="NQ MAR25", quantity=1, take_profit=15, stop_loss=20,
+        reactivation_distance=10, nt_account="Sim101", price_stream_channel="test",
+        fibonacci_ratios=[0, 0.5, 1.0, 1.618, -0.618], is_backtest=True, quiet=True,
+    )
+    bot.trading_schedule = TradingSchedule([(time(0, 0), time(23, 59, 59))])
+    return bot
+
+
+def messages(prices):
+    return [("test", encode_json(price, START + timedelta(milliseconds=250 * i)), 0) for i, price in enumerate(prices)]
+
+
+def trades(bot):
+    return [(c.metadata.fibRatioLevel, c.metadata.positionType, c.metadata.positionEntryPrice, c.outcome, c.net)
+            for c in bot.closed_positions]
+
+
+def run_both(prices, burst, lead=1):
+    batch = messages(prices)
+    per_tick = make_bot()
+    for _, data, _ in batch:
+        per_tick.process_tick(*per_tick.decode_price_message(data))
+    conflated = make_bot()
+    conflated.conflation_depth = 1
+    for message in batch[:lead]:
+        conflated.process_messages([message])
+    for start in range(lead, len(batch), burst):
+        conflated.process_messages(batch[start:start + burst])
+    return per_tick, conflated
+
+
+def test_burst_across_an_entry_matches_per_tick():
+    level = make_bot().fib_levels[0.0]
+    # Moving 11 points above `level` activates it with a BUY; the burst fills it at
+    # level - 25 and then reaches its take profit
+    per_tick, conflated = run_both([level + 12, level + 11, level - 25, level - 5], burst=2, lead=2)
+    assert trades(per_tick) == [(0.0, "LONG", level - 25, "PROFIT", 15)]
+    assert trades(conflated) == trades(per_tick)
+
+
+def test_random_walk_bursts_match_per_tick():
+    rng = random.Random(7)
+    prices, price = [], 20050.0
+    for _ in range(20_000):
+        price += rng.choice((-0.25, 0.25)) * rng.randint(1, 8)
+        prices.append(price)
+    per_tick, conflated = run_both(prices, burst=25)
+    assert len(trades(per_tick)) > 20
+    assert trades(conflated) == trades(per_tick)
+    assert conflated.stats.equity == per_tick.stats.equity
+    assert conflated.conflated_ticks > 0
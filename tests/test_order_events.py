@@ -0,0 +1,35 @@
+"""A placement NinjaTrader rejects must not leave a phantom pending order behind."""
+from datetime import datetime, time
+
+from tickr.core.gateway import REJECTED, OrderEvent
+from tickr.strategies.fibonacci.config import TradingSchedule
+from tickr.strategies.fibonacci.run import FibonacciTradingBot
+
+START = datetime(2025, 3, 12, 10, 0)
+
+
+def test_rejected_order_frees_its_level():
+    bot = FibonacciTradingBot(
+        point_a=20100, point_b=20000, instrument="NQ MAR25", quantity=1, take_profit=15, stop_loss=20,
+        reactivation_distance=10, nt_account="Sim101", price_stream_channel="test",
+        fibonacci_ratios=[0, 0.5, 1.0, 1.618, -0.618], is_backtest=True, quiet=True,
+    )
+    bot.trading_schedule = TradingSchedule([(time(0, 0), time(23, 59, 59))])
+    level = bot.fib_levels[0.0]
+    # The first tick opens the trading window, the second activates the level with a BUY
+    bot.process_price(level + 12, START)
+    bot.process_price(level + 11, START)
+    [handle] = [handle for handle in bot.orders_placed_ninjatrader if handle.price == level]
+    assert handle.reference in bot.internal_pending_orders_inventory
+
+    bot.order_events.put(OrderEvent(handle, REJECTED, "rejected by NinjaTrader"))
+    bot.handle_order_events()
+    assert handle.reference not in bot.internal_pending_orders_inventory
+    assert not bot.active_levels[0.0]
+    # Crossing the level no longer opens a position
+    bot.process_price(level - 1, START)
+    assert not bot.open_positions
+    # Moving away by the reactivation distance places it again
+    bot.process_price(level + 11, START)
+    assert bot.active_levels[0.0]
+    assert [order.price for order in bot.internal_pending_orders_inventory.values()].count(level) == 1
@@ -0,0 +1,60 @@
+"""Restart reconciliation: the recovered state must match what NinjaTrader still holds."""
+from datetime import date, datetime, time
+
+from nt8.client import NTClient
+from tickr.strategies.fibonacci.config import TradingSchedule
+from tickr.strategies.fibonacci.records import OpenPositionRecord, PendingOrderRecord, to_row
+from tickr.strategies.fibonacci.run import FibonacciTradingBot
+
+START = datetime(2025, 3, 12, 10, 0)
+
+
+def make_bot(values):
+    ntclient = NTClient()
+    for key, value in values.items():
+        ntclient.add_value(key, value)
+    bot = FibonacciTradingBot(
+        point_a=20100, point_b=20000, instrument="NQ MAR25", quantity=1, take_profit=15, stop_loss=20,
+        reactivation_distance=10, nt_account="Sim101", price_stream_channel="test",
+        fibonacci_ratios=[0, 0.5, 1.0, 1.618, -0.618], is_backtest=True, quiet=True, ntclient=ntclient,
+    )
+    bot.trading_schedule = TradingSchedule([(time(0, 0), time(23, 59, 59))])
+    return bot
+
+
+def journal(level_price):
+    pending = PendingOrderRecord("pending-1", "NQ MAR25", "BUY", level_price, 0.0, level_price + 15, level_price - 20, START)
+    position = OpenPositionRecord("NQ MAR25", 0.5, "LONG", 20050.0, START, 20065.0, 20030.0)
+    return [
+        [1, "day", date.today().isoformat()],
+        [2, "window", True],
+        [3, "level", 0.0, True],
+        [4, "pending", "pending-1", to_row(pending)],
+        [5, "nt_order", ["pending-1", "NT-1", "OCO-1", "tpl", "NQ MAR25", "Sim101", "BUY", 1, level_price]],
+        [6, "open", "position-1", to_row(position)],
+        [7, "nt_order", ["position-1", "NT-2", "OCO-2", "tpl", "NQ MAR25", "Sim101", "BUY", 1, 20050.0]],
+    ]
+
+
+def test_flat_positions_and_dead_orders_are_dropped():
+    bot = make_bot({"OrderStatus|NT-1": "Cancelled", "OrderStatus|NT-2": "Filled", "MarketPosition|NQ MAR25|Sim101": "0"})
+    level = bot.fib_levels[0.0]
+    bot.restore(None, journal(level))
+    bot.reconcile_orders()
+
+    # The ATM brackets closed the position while the bot was down: it must not be closed a second time
+    assert not bot.open_positions
+    assert bot.trigger_book.bounds() == make_bot({}).trigger_book.bounds()
+    # The cancelled order is not re-placed blindly; the first tick in the window places it again
+    assert not bot.internal_pending_orders_inventory
+    assert bot.active_levels[0.0] and not bot.isTradingZoneActive
+    bot.process_price(level + 12, START)
+    assert [order.price for order in bot.internal_pending_orders_inventory.values()] == [level]
+
+
+def test_held_position_is_kept():
+    bot = make_bot({"OrderStatus|NT-1": "Working", "OrderStatus|NT-2": "Filled", "MarketPosition|NQ MAR25|Sim101": "1"})
+    bot.restore(None, journal(bot.fib_levels[0.0]))
+    bot.reconcile_orders()
+    assert list(bot.open_positions) == ["position-1"]
+    assert list(bot.internal_pending_orders_inventory) == ["pending-1"]
@@ -0,0 +1,45 @@
+"""Range-preserving tick conflation for bursts in the price stream."""
+from datetime import datetime
+from typing import Callable, Hashable, List, NamedTuple, Sequence, Tuple
+
+
+class ConflatedTick(NamedTuple):
+    """Several ticks merged into one update: the last price/time plus the range they covered."""
+    last: int
+    low: int
+    high: int
+    timestamp: datetime
+    count: int
+
+
+def conflate(ticks: Sequence[Tuple[int, datetime]], key: Callable[[datetime], Hashable] = None) -> List[ConflatedTick]:
+    """Merge consecutive (price, timestamp) ticks into min/max/last updates.
+
+    Without `key` the whole sequence becomes one update. With `key`, a new update is
+    started whenever `key(timestamp)` changes (e.g. the trading window opening), so
+    ticks on different sides of such an edge are never merged.
+    """
+    updates: List[ConflatedTick] = []
+    if not ticks:
+        return updates
+
+    price, timestamp = ticks[0]
+    low = high = price
+    count = 0
+    current_key = key(timestamp) if key else None
+    for price, tick_timestamp in ticks:
+        if key:
+            tick_key = key(tick_timestamp)
+            if tick_key != current_key:
+                updates.append(ConflatedTick(last, low, high, timestamp, count))
+                low = high = price
+                count = 0
+                current_key = tick_key
+        if price < low:
+            low = price
+        elif price > high:
+            high = price
+        last, timestamp = price, tick_timestamp
+        count += 1
+    updates.append(ConflatedTick(last, low, high, timestamp, count))
+    return updates
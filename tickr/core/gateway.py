@@ -0,0 +1,252 @@
+"""Order gateway: NinjaTrader order I/O on a worker thread.
+
+The strategy calls `place()`/`cancel()` on the tick thread and gets an `OrderHandle`
+back immediately. The worker resolves the ATM template (cached per TP/SL key),
+builds the `Order`, places it with retries and reports the outcome as an
+`OrderEvent` on the caller's event queue. A failed attempt is only retried when
+NinjaTrader reports no status for the order, so a command that did go out is
+never sent twice. Commands run in the order they were
+submitted, so a cancel never overtakes the placement it refers to; commands that
+are queued together are written to the socket together. A placed order whose
+NinjaTrader status later turns to Rejected is reported as REJECTED as soon as that
+status arrives.
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+from core.order import Order
+from nt8.client import FINAL_ORDER_STATUSES, NTClient
+from utilities.helper import generate_strategy
+from utilities.latency import LATENCY, now_ns
+
+QUEUED = "QUEUED"
+PLACED = "PLACED"
+REJECTED = "REJECTED"
+CANCELLED = "CANCELLED"
+SIMULATED = "SIMULATED"
+
+
+class OrderHandle:
+    """What the strategy holds for an order while the gateway works on it."""
+
+    __slots__ = (
+        "instrument", "account", "action", "quantity", "price", "template_key", "tick_timestamp",
+        "status", "order", "error", "attempts", "cancel_requested", "queued_ns", "tick_ns", "events", "reference",
+    )
+
+    def __init__(self, instrument, account, action, quantity, price, template_key, tick_timestamp, events, reference=None):
+        self.instrument = instrument
+        self.account = account
+        self.action = action
+        self.quantity = quantity
+        self.price = price
+        self.template_key = template_key
+        self.tick_timestamp = tick_timestamp
+        self.status = QUEUED
+        self.order: Optional[Order] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.cancel_requested = False
+        self.queued_ns = 0
+        self.tick_ns = 0
+        self.events: Optional[queue.SimpleQueue] = events
+        # The caller's id for this order (the strategy's pending order id)
+        self.reference = reference
+
+    def __repr__(self) -> str:
+        return f"OrderHandle({self.action} {self.quantity} {self.instrument} @ {self.price}, {self.status})"
+
+
+class OrderEvent(NamedTuple):
+    """Acknowledgement from the gateway: `status` is the handle's new status."""
+    handle: OrderHandle
+    status: str
+    error: Optional[str] = None
+
+
+class OrderGateway:
+    """Single worker thread serialising order commands onto one `NTClient`.
+
+    Several strategies can share a gateway (and its connection); each passes its own
+    `events` queue to `place()` and receives the acknowledgements for its orders
+    there. With `dry_run` (backtests) nothing is sent: `place()` returns a handle
+    that is already SIMULATED and no thread is started.
+    """
+
+    def __init__(
+        self,
+        ntclient: NTClient,
+        resolve_template: Callable[[str, str], str] = generate_strategy,
+        retries: int = 2,
+        retry_delay: float = 0.25,
+        dry_run: bool = False,
+    ):
+        self.ntclient = ntclient
+        self.resolve_template = resolve_template
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.dry_run = dry_run
+        self.commands: queue.SimpleQueue = queue.SimpleQueue()
+        self.templates: Dict[tuple, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def place(self, instrument: str, account: str, action: str, quantity: int, price: float,
+              template_key: str, tick_timestamp=None, events: Optional[queue.SimpleQueue] = None,
+              reference: Optional[str] = None) -> OrderHandle:
+        """Queue an order placement and return its handle without waiting for NinjaTrader."""
+        handle = OrderHandle(instrument, account, action, quantity, price, template_key, tick_timestamp, events, reference)
+        if self.dry_run:
+            handle.status = SIMULATED
+            return handle
+        handle.queued_ns = LATENCY.order_started()
+        handle.tick_ns = LATENCY.tick_received_ns
+        self.start()
+        self.commands.put((self._place, handle))
+        return handle
+
+    def attach(self, order: Order, account: str, template_key: str, events: Optional[queue.SimpleQueue] = None,
+               reference: Optional[str] = None) -> OrderHandle:
+        """Handle for an order that is already working on NinjaTrader (e.g. placed before a restart)."""
+        handle = OrderHandle(order.instrument_name, account, order.action, order.quantity, order.price,
+                             template_key, None, events, reference)
+        handle.order = order
+        handle.status = PLACED
+        return handle
+
+    def cancel(self, handle: OrderHandle) -> None:
+        """Queue a cancel. A placement that hasn't been sent yet is dropped instead."""
+        if handle.status in (CANCELLED, REJECTED):
+            return
+        if self.dry_run or handle.status == SIMULATED:
+            handle.status = CANCELLED
+            return
+        handle.cancel_requested = True
+        self.start()
+        self.commands.put((self._cancel, handle))
+
+    def _notify(self, handle: OrderHandle, status: str, error: Optional[str] = None) -> None:
+        handle.status = status
+        handle.error = error
+        if handle.events is not None:
+            handle.events.put(OrderEvent(handle, status, error))
+
+    def template(self, template_key: str, instrument: str) -> str:
+        key = (template_key, instrument)
+        template = self.templates.get(key)
+        if template is None:
+            template = self.templates[key] = self.resolve_template(template_key, instrument)
+        return template
+
+    def _place(self, handle: OrderHandle) -> None:
+        if handle.cancel_requested:
+            self._notify(handle, CANCELLED)
+            return
+        picked = now_ns()
+        if handle.queued_ns:
+            LATENCY.record("order_queue", handle.queued_ns, picked)
+        error = None
+        while handle.attempts <= self.retries:
+            handle.attempts += 1
+            try:
+                if handle.order is None:
+                    handle.order = Order(
+                        instrument_name=handle.instrument,
+                        action=handle.action,
+                        quantity=handle.quantity,
+                        price=handle.price,
+                        strategy=self.template(handle.template_key, handle.instrument),
+                    )
+                LATENCY.order_sending(handle.queued_ns, handle.tick_ns)
+                handle.order.place(self.ntclient, handle.account)
+            except Exception as e:
+                error = str(e)
+                logger.warning(f"Order placement attempt {handle.attempts} failed for {handle}: {e}")
+                if self._reached_ninjatrader(handle):
+                    # The command went out before the failure; sending it again would duplicate the order
+                    logger.warning(f"NinjaTrader reported {handle.order.id} anyway, not resending")
+                    break
+                if handle.attempts <= self.retries:
+                    time.sleep(self.retry_delay)
+                continue
+            break
+        else:
+            self._notify(handle, REJECTED, error)
+            return
+        LATENCY.record("place_order", picked)
+        self._notify(handle, PLACED)
+        self.ntclient.watch(f"OrderStatus|{handle.order.id}", FINAL_ORDER_STATUSES.__contains__).add_done_callback(
+            lambda future, handle=handle: self._order_finished(handle, future))
+
+    def _reached_ninjatrader(self, handle: OrderHandle) -> bool:
+        # NinjaTrader reports a status for every order it received, usually within milliseconds
+        if handle.order is None or not handle.order.id:
+            return False
+        return self.ntclient.wait_for(f"OrderStatus|{handle.order.id}", timeout=self.retry_delay) is not None
+
+    def _order_finished(self, handle: OrderHandle, future) -> None:
+        # Runs on the ATI socket thread when NinjaTrader reports a final status
+        if not future.cancelled() and future.result() == "Rejected" and handle.status == PLACED:
+            self._notify(handle, REJECTED, "rejected by NinjaTrader")
+
+    def _cancel(self, handle: OrderHandle) -> None:
+        if handle.status != PLACED:
+            # Never sent (dropped by _place or rejected): nothing to cancel on NinjaTrader
+            if handle.status == QUEUED:
+                self._notify(handle, CANCELLED)
+            return
+        try:
+            handle.order.cancel(self.ntclient, handle.account)
+            self._notify(handle, CANCELLED)
+        except Exception as e:
+            logger.error(f"Error cancelling order {handle}: {e}")
+            if handle.events is not None:
+                handle.events.put(OrderEvent(handle, handle.status, str(e)))
+
+    def _run(self) -> None:
+        while True:
+            command = self.commands.get()
+            # A burst (e.g. every level placed when the trading window opens) goes out in one socket write
+            with self.ntclient.batch():
+                while command is not None:
+                    action, handle = command
+                    try:
+                        action(handle)
+                    except Exception as e:
+                        logger.error(f"Order gateway failed on {handle}: {e}")
+                    try:
+                        command = self.commands.get_nowait()
+                    except queue.Empty:
+                        break
+            if command is None:
+                return
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="order-gateway", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Run every queued command, then stop the worker thread."""
+        if self._thread is None:
+            return
+        self.commands.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    @staticmethod
+    def poll_events(events: queue.SimpleQueue) -> List[OrderEvent]:
+        """Drain an event queue without blocking."""
+        drained = []
+        while True:
+            try:
+                drained.append(events.get_nowait())
+            except queue.Empty:
+                return drained
@@ -0,0 +1,143 @@
+"""Deferred logging for the tick path.
+
+`hotlog.debug("reactivation", "{}: Reactivated {}", ts, ratio)` checks the level with
+one integer comparison and, when enabled, appends the unformatted record to a ring
+buffer. A background thread formats the records and hands them to loguru, so
+formatting and sink I/O (stderr, rotating files) never run on the tick thread.
+Chatty categories can be sampled: only every n-th record of the category is kept.
+"""
+import atexit
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Dict, Optional
+
+from loguru import logger
+
+LEVELS = {"TRACE": 5, "DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+
+def parse_sampling(value: Optional[str]) -> Dict[str, int]:
+    """Parse 'category=n,category=n' into {category: n}."""
+    sampling = {}
+    for part in (value or "").split(","):
+        if part.strip():
+            category, every = part.split("=")
+            sampling[category.strip()] = int(every)
+    return sampling
+
+
+def _restamp(stamp: float, category: str, record) -> None:
+    """Keep the time the record was emitted and show the category in place of the function."""
+    # Built from loguru's own datetime subclass so the sink's time format still applies
+    record["time"] = type(record["time"]).fromtimestamp(stamp, record["time"].tzinfo)
+    record["function"] = category
+
+
+class HotLogger:
+    def __init__(self, level: str = "INFO", capacity: int = 65_536, flush_interval: float = 0.05):
+        self.level_no = LEVELS[level.upper()]
+        self.buffer = deque(maxlen=capacity)
+        self.flush_interval = flush_interval
+        self.sampling: Dict[str, int] = {}
+        self._seen: Dict[str, int] = {}
+        self.dropped = 0
+        self.sampled_out = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file_sink: Optional[int] = None
+
+    def configure(self, level: str = "INFO", log_dir: Optional[str] = None, sampling: Optional[Dict[str, int]] = None,
+                  rotation: str = "50 MB", retention: int = 10) -> None:
+        """Set the level and sampling, optionally add a rotating file sink, and start the writer thread."""
+        self.level_no = LEVELS[level.upper()]
+        self.sampling = dict(sampling or {})
+        self._seen = {}
+        if self._file_sink is not None:
+            # configure_logging() resets loguru sinks (`logger.remove()`) first, which may already have removed it
+            with contextlib.suppress(ValueError):
+                logger.remove(self._file_sink)
+            self._file_sink = None
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+            self._file_sink = logger.add(os.path.join(log_dir, "tickr_{time}.log"), level=level.upper(),
+                                         rotation=rotation, retention=retention)
+        self.start()
+
+    def _emit(self, level: str, category: str, message: str, args: tuple) -> None:
+        every = self.sampling.get(category)
+        if every:
+            seen = self._seen.get(category, 0)
+            self._seen[category] = seen + 1
+            if seen % every:
+                self.sampled_out += 1
+                return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append((time.time(), level, category, message, args))
+
+    def debug(self, category: str, message: str, *args) -> None:
+        if self.level_no <= 10:
+            self._emit("DEBUG", category, message, args)
+
+    def info(self, category: str, message: str, *args) -> None:
+        if self.level_no <= 20:
+            self._emit("INFO", category, message, args)
+
+    def success(self, category: str, message: str, *args) -> None:
+        if self.level_no <= 25:
+            self._emit("SUCCESS", category, message, args)
+
+    def warning(self, category: str, message: str, *args) -> None:
+        if self.level_no <= 30:
+            self._emit("WARNING", category, message, args)
+
+    def flush(self) -> None:
+        """Format and write everything buffered so far (runs on the writer thread, or at exit)."""
+        buffer = self.buffer
+        while buffer:
+            stamp, level, category, message, args = buffer.popleft()
+            try:
+                text = message.format(*args) if args else message
+            except (IndexError, KeyError, ValueError) as e:
+                text = f"{message} {args} (format error: {e})"
+            logger.patch(partial(_restamp, stamp, category)).log(level, text)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="hotlog-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread after it has written every buffered record."""
+        if self._thread is not None and self._thread.is_alive():
+            self._stopped.set()
+            self._wake.set()
+            self._thread.join()
+        self.flush()
+        if self.dropped or self.sampled_out:
+            logger.info(f"Hot path logging: {self.dropped} records dropped (buffer full), {self.sampled_out} sampled out")
+
+
+hotlog = HotLogger()
+atexit.register(hotlog.stop)
+
+
+def configure_logging(level: str = "INFO", log_dir: Optional[str] = None, sampling: Optional[Dict[str, int]] = None) -> None:
+    """Process-wide logging setup, done once by an entry point: stderr at `level` plus the tick path logger."""
+    logger.remove()
+    logger.add(sys.stderr, level=level)
+    hotlog.configure(level=level, log_dir=log_dir, sampling=sampling)
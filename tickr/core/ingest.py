@@ -0,0 +1,140 @@
+"""Asyncio price stream ingestion: socket reads are decoupled from tick processing by a bounded queue."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+# (channel, raw message data, monotonic receive time in ns)
+QueuedMessage = Tuple[str, object, int]
+
+
+class IngestStats:
+    """Counters of one ingestion run; lag is the time a message waited in the queue."""
+
+    __slots__ = ("received", "processed", "dropped", "errors", "reconnects", "depth", "max_depth", "last_lag_ns", "max_lag_ns")
+
+    def __init__(self):
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.last_lag_ns = 0
+        self.max_lag_ns = 0
+
+    def summary(self) -> str:
+        return (
+            f"received={self.received} processed={self.processed} dropped={self.dropped} errors={self.errors} "
+            f"reconnects={self.reconnects} depth={self.depth} max_depth={self.max_depth} "
+            f"lag={self.last_lag_ns / 1e6:.3f}ms max_lag={self.max_lag_ns / 1e6:.3f}ms"
+        )
+
+
+class PriceIngestor:
+    """Reads a Redis pubsub on the event loop and feeds a bounded queue consumed by `handler`.
+
+    `handler(batch)` receives every message queued since its previous call, in arrival
+    order, and runs on a single dedicated thread so slow strategy work (order placement)
+    never blocks socket reads. When the queue is full the oldest message is dropped and
+    counted. Errors in the reader reconnect with a backoff; errors in the handler are
+    logged and counted, and ingestion keeps going.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable],
+        channels: List[str],
+        handler: Callable[[List[QueuedMessage]], None],
+        maxsize: int = 10_000,
+        should_stop: Callable[[], bool] = lambda: False,
+        stats_interval: float = 60.0,
+    ):
+        self.connect = connect
+        self.channels = channels
+        self.handler = handler
+        self.maxsize = maxsize
+        self.should_stop = should_stop
+        self.stats_interval = stats_interval
+        self.stats = IngestStats()
+        self.queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-processor")
+
+    def _enqueue(self, item: QueuedMessage) -> None:
+        queue, stats = self.queue, self.stats
+        if queue.full():
+            queue.get_nowait()
+            stats.dropped += 1
+        queue.put_nowait(item)
+        stats.received += 1
+        stats.depth = queue.qsize()
+        if stats.depth > stats.max_depth:
+            stats.max_depth = stats.depth
+
+    async def _read(self) -> None:
+        backoff = 0.5
+        while True:
+            client = pubsub = None
+            try:
+                client = await self.connect()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(*self.channels)
+                logger.debug(f"Listening for price stream on {', '.join(self.channels)}...")
+                backoff = 0.5
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._enqueue((message["channel"], message["data"], time.monotonic_ns()))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.reconnects += 1
+                logger.error(f"Price stream read failed: {e}. Reconnecting in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+                if client is not None:
+                    await client.aclose()
+
+    def _process(self, batch: List[QueuedMessage]) -> None:
+        try:
+            self.handler(batch)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Error processing price batch: {e}")
+        self.stats.processed += len(batch)
+
+    async def _consume(self) -> None:
+        loop, queue, stats = asyncio.get_running_loop(), self.queue, self.stats
+        while not self.should_stop():
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            stats.depth = 0
+            stats.last_lag_ns = time.monotonic_ns() - batch[0][2]
+            if stats.last_lag_ns > stats.max_lag_ns:
+                stats.max_lag_ns = stats.last_lag_ns
+            await loop.run_in_executor(self._executor, self._process, batch)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            logger.info(f"Price ingestion: {self.stats.summary()}")
+
+    async def run(self) -> None:
+        """Ingest until `should_stop()` returns True (checked after every processed batch)."""
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        tasks = [asyncio.create_task(self._read()), asyncio.create_task(self._report())]
+        try:
+            await self._consume()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._executor.shutdown(wait=True)
+            logger.info(f"Price ingestion stopped: {self.stats.summary()}")
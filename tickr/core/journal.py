@@ -0,0 +1,134 @@
+"""Append-only state journal for crash recovery.
+
+Entries are small JSON arrays, ``[seq, kind, *fields]``, one per line. `append()`
+only puts the entry on a queue; a writer thread writes batches and fsyncs at most
+every `fsync_interval` seconds, so the tick thread never waits on the disk.
+`snapshot(state)` writes the full state atomically (temp file + rename) and then
+truncates the journal. The snapshot records the sequence number it covers, so
+entries left over from a crash between the rename and the truncate are skipped
+on load.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+_CLOSE = object()
+
+
+class Journal:
+    def __init__(self, directory: str, name: str, fsync_interval: float = 0.1, snapshot_every: int = 1_000):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.entries_since_snapshot = 0
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._last_sync = 0.0
+
+    @property
+    def snapshot_due(self) -> bool:
+        return self.entries_since_snapshot >= self.snapshot_every
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[list]]:
+        """Last snapshot (or None) and the entries written after it, in order."""
+        snapshot = None
+        covered = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as file:
+                snapshot = json.load(file)
+            covered = snapshot["seq"]
+        entries = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn write at the crash point; nothing after it was acknowledged
+                    if entry[0] > covered:
+                        entries.append(entry)
+        self.seq = entries[-1][0] if entries else covered
+        return snapshot, entries
+
+    def open(self) -> None:
+        """Start appending (after `load()`, so sequence numbers continue)."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = open(self.journal_path, "a")
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, kind: str, *fields) -> None:
+        self.seq += 1
+        self.entries_since_snapshot += 1
+        self.queue.put([self.seq, kind, *fields])
+
+    def snapshot(self, state: Dict[str, Any]) -> None:
+        """Queue a snapshot of `state`, which must already include every appended entry."""
+        state["seq"] = self.seq
+        self.entries_since_snapshot = 0
+        self.queue.put(state)
+
+    def close(self, discard: bool = False) -> None:
+        """Write and sync everything queued; with `discard` the journal and snapshot are deleted (clean shutdown)."""
+        if self._thread is not None:
+            self.queue.put(_CLOSE)
+            self._thread.join()
+            self._thread = None
+        if discard:
+            for path in (self.journal_path, self.snapshot_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def _write_snapshot(self, state: Dict[str, Any]) -> None:
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file, default=str)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self._file.seek(0)
+        self._file.truncate()
+        self._sync()
+
+    def _run(self) -> None:
+        unsynced = False
+        while True:
+            try:
+                item = self.queue.get(timeout=self.fsync_interval if unsynced else None)
+            except queue.Empty:
+                self._sync()
+                unsynced = False
+                continue
+            batch = [item]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for item in batch:
+                if item is _CLOSE:
+                    self._sync()
+                    self._file.close()
+                    return
+                if isinstance(item, dict):
+                    self._write_snapshot(item)
+                    unsynced = False
+                else:
+                    self._file.write(json.dumps(item, default=str))
+                    self._file.write("\n")
+                    unsynced = True
+            if unsynced and time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+                unsynced = False
@@ -0,0 +1,43 @@
+"""Readiness-based startup: run the warm-up tasks concurrently and go live once all of them are done."""
+import concurrent.futures
+import time
+from typing import Callable, Dict
+
+from loguru import logger
+
+
+class StartupError(RuntimeError):
+    pass
+
+
+def warm_up(tasks: Dict[str, Callable[[], object]], timeout: float = 30.0) -> Dict[str, float]:
+    """Run every task on its own thread and return {name: seconds} once all have finished.
+
+    Raises StartupError as soon as a task fails, or if some are still running after `timeout` seconds.
+    """
+    durations: Dict[str, float] = {}
+    if not tasks:
+        return durations
+
+    def timed(task):
+        started = time.perf_counter()
+        task()
+        return time.perf_counter() - started
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="warm-up")
+    futures = {executor.submit(timed, task): name for name, task in tasks.items()}
+    try:
+        for future in concurrent.futures.as_completed(futures, timeout=timeout):
+            name = futures[future]
+            try:
+                durations[name] = future.result()
+            except Exception as e:
+                raise StartupError(f"{name} failed: {e}") from e
+            logger.debug(f"{name} ready in {durations[name]:.2f}s")
+    except concurrent.futures.TimeoutError:
+        pending = [name for name in tasks if name not in durations]
+        raise StartupError(f"not ready after {timeout:.0f}s: {', '.join(pending)}") from None
+    finally:
+        # Don't wait for a task that is stuck (e.g. a connect that never returns)
+        executor.shutdown(wait=False, cancel_futures=True)
+    return durations
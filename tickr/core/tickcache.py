@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+from loguru import logger
+
+from tickr.core.timeparse import parse_export_timestamps
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache"
+
+# Column files: name -> dtype
+_COLUMNS = {
+    "timestamps": np.int64,  # epoch nanoseconds of the (naive) exchange timestamp
+    "prices": np.int32,      # last price in instrument ticks
+    "volumes": np.int32,
+}
+
+
+class TickData(NamedTuple):
+    timestamps: np.ndarray  # int64 epoch ns
+    prices: np.ndarray      # int32 price in ticks
+    volumes: np.ndarray     # int32
+    ticks_per_point: int
+
+    def timestamps_us(self) -> np.ndarray:
+        """Timestamps as datetime64[us], the resolution of the scalar strptime path."""
+        return self.timestamps.view("datetime64[ns]").astype("datetime64[us]")
+
+    def prices_in_points(self) -> np.ndarray:
+        return self.prices / self.ticks_per_point
+
+
+def read_last_export(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read a `.Last.txt` export into (datetime64[us] timestamps, float64 prices, int64 volumes).
+
+    Rows the scalar backtest would skip (too few fields, bad price or timestamp) are dropped.
+    """
+    stamps: List[str] = []
+    prices: List[float] = []
+    volumes: List[int] = []
+    with open(path, "r") as file:
+        for line in file:
+            parts = line.strip().split(";")
+            if len(parts) < 2:
+                continue
+            try:
+                price = float(parts[1])
+            except ValueError:
+                continue
+            try:
+                volume = int(parts[4]) if len(parts) > 4 else 0
+            except ValueError:
+                volume = 0
+            stamps.append(parts[0])
+            prices.append(price)
+            volumes.append(volume)
+
+    timestamps, valid = parse_export_timestamps(np.array(stamps, dtype=str))
+    return (
+        timestamps[valid],
+        np.array(prices, dtype=np.float64)[valid],
+        np.array(volumes, dtype=np.int64)[valid],
+    )
+
+
+def cache_dir_for(path: str) -> str:
+    return os.path.abspath(path) + CACHE_SUFFIX
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_meta(cache_dir: str) -> dict:
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(cache_dir: str, meta: dict) -> None:
+    tmp_path = os.path.join(cache_dir, "meta.json.tmp")
+    with open(tmp_path, "w") as file:
+        json.dump(meta, file)
+    os.replace(tmp_path, os.path.join(cache_dir, "meta.json"))
+
+
+def build_tick_cache(path: str, ticks_per_point: int) -> dict:
+    """Convert a `.Last.txt` export into columnar binary files next to it and return the cache metadata."""
+    stat = os.stat(path)
+    timestamps, prices, volumes = read_last_export(path)
+    columns = {
+        "timestamps": timestamps.astype("datetime64[ns]").view(np.int64),
+        "prices": np.rint(prices * ticks_per_point),
+        "volumes": volumes,
+    }
+
+    cache_dir = cache_dir_for(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, dtype in _COLUMNS.items():
+        tmp_path = os.path.join(cache_dir, f"{name}.bin.tmp")
+        columns[name].astype(dtype).tofile(tmp_path)
+        os.replace(tmp_path, os.path.join(cache_dir, f"{name}.bin"))
+
+    meta = {
+        "version": CACHE_VERSION,
+        "rows": int(timestamps.shape[0]),
+        "ticks_per_point": ticks_per_point,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha1": _file_hash(path),
+    }
+    _write_meta(cache_dir, meta)
+    logger.info(f"Built tick cache for {path}: {meta['rows']} rows")
+    return meta
+
+
+def _is_cache_valid(path: str, meta: dict, ticks_per_point: int) -> bool:
+    if meta.get("version") != CACHE_VERSION or meta.get("ticks_per_point") != ticks_per_point:
+        return False
+    stat = os.stat(path)
+    if meta.get("source_size") == stat.st_size and meta.get("source_mtime_ns") == stat.st_mtime_ns:
+        return True
+    # Touched but possibly unchanged (copied, re-exported): fall back to the content hash
+    if meta.get("source_size") == stat.st_size and meta.get("source_sha1") == _file_hash(path):
+        meta["source_mtime_ns"] = stat.st_mtime_ns
+        _write_meta(cache_dir_for(path), meta)
+        return True
+    return False
+
+
+def load_ticks(path: str, ticks_per_point: int) -> TickData:
+    """Memory-map the binary tick cache for `path`, (re)building it when the source file changed."""
+    cache_dir = cache_dir_for(path)
+    meta = _read_meta(cache_dir)
+    if not _is_cache_valid(path, meta, ticks_per_point):
+        meta = build_tick_cache(path, ticks_per_point)
+
+    columns = {}
+    for name, dtype in _COLUMNS.items():
+        if meta["rows"]:
+            columns[name] = np.memmap(os.path.join(cache_dir, f"{name}.bin"), dtype=dtype, mode="r", shape=(meta["rows"],))
+        else:
+            columns[name] = np.empty(0, dtype=dtype)
+    return TickData(ticks_per_point=ticks_per_point, **columns)
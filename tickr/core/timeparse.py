@@ -0,0 +1,114 @@
+"""Fast parsers for the fixed-width tick timestamps (NinjaTrader exports and the Redis price stream).
+
+Inputs that don't match the fixed layout fall back to `datetime.strptime`, so results and errors are unchanged.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+EXPORT_FORMAT = "%Y%m%d %H%M%S %f"
+STREAM_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+class _Layout(NamedTuple):
+    width: int
+    fields: Tuple[Tuple[int, int], ...]  # year, month, day, hour, minute, second, microsecond
+    separators: Dict[int, str]
+
+
+EXPORT_LAYOUT = _Layout(
+    width=23,
+    fields=((0, 4), (4, 6), (6, 8), (9, 11), (11, 13), (13, 15), (16, 22)),
+    separators={8: " ", 15: " "},
+)
+STREAM_LAYOUT = _Layout(
+    width=26,
+    fields=((0, 4), (5, 7), (8, 10), (11, 13), (14, 16), (17, 19), (20, 26)),
+    separators={4: "-", 7: "-", 10: " ", 13: ":", 16: ":", 19: "."},
+)
+
+
+@lru_cache(maxsize=64)
+def _export_date(text: str) -> Tuple[int, int, int]:
+    return datetime.strptime(text, "%Y%m%d").timetuple()[:3]
+
+
+@lru_cache(maxsize=64)
+def _stream_date(text: str) -> Tuple[int, int, int]:
+    return datetime.strptime(text, "%Y-%m-%d").timetuple()[:3]
+
+
+def parse_export_timestamp(text: str) -> datetime:
+    """Parse a raw export timestamp field, e.g. ``20250314 093000 1230000``."""
+    if (
+        len(text) == 23
+        and text[8] == " "
+        and text[15] == " "
+        and text[9:15].isdigit()
+        and text[16:22].isdigit()
+        and text[22].isdigit()
+    ):
+        year, month, day = _export_date(text[:8])
+        return datetime(year, month, day, int(text[9:11]), int(text[11:13]), int(text[13:15]), int(text[16:22]))
+    return datetime.strptime(text[:-1], EXPORT_FORMAT)
+
+
+def parse_stream_timestamp(text: str) -> datetime:
+    """Parse a price stream timestamp, e.g. ``2025-03-14 09:30:00.123456``."""
+    if (
+        len(text) == 26
+        and text[10] == " "
+        and text[13] == ":"
+        and text[16] == ":"
+        and text[19] == "."
+        and text[11:13].isdigit()
+        and text[14:16].isdigit()
+        and text[17:19].isdigit()
+        and text[20:26].isdigit()
+    ):
+        year, month, day = _stream_date(text[:10])
+        return datetime(year, month, day, int(text[11:13]), int(text[14:16]), int(text[17:19]), int(text[20:26]))
+    return datetime.strptime(text, STREAM_FORMAT)
+
+
+def _parse_bulk(stamps: np.ndarray, layout: _Layout) -> Tuple[np.ndarray, np.ndarray]:
+    stamps = np.asarray(stamps)
+    raw = np.frombuffer(stamps.astype(f"S{layout.width}").tobytes(), dtype=np.uint8).reshape(-1, layout.width)
+    digits = raw - np.uint8(ord("0"))  # non-digits wrap around to values > 9
+
+    digit_cols = np.ones(layout.width, dtype=bool)
+    digit_cols[list(layout.separators)] = False
+    valid = (digits[:, digit_cols] <= 9).all(axis=1)
+    for col, separator in layout.separators.items():
+        valid &= raw[:, col] == ord(separator)
+    # Shorter values are caught by the NUL padding; longer ones were truncated by astype
+    chars = stamps.dtype.itemsize // 4 if stamps.dtype.kind == "U" else stamps.dtype.itemsize
+    if chars > layout.width and stamps.size:
+        valid &= np.char.str_len(stamps) == layout.width
+
+    year, month, day, hour, minute, second, micro = (
+        digits[:, start:stop].astype(np.int64) @ (10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int64))
+        for start, stop in layout.fields
+    )
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (hour < 24) & (minute < 60) & (second < 60)
+
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    month_length = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    valid &= day <= month_length
+
+    timestamps = months.astype("datetime64[D]").astype("datetime64[us]")
+    offset_s = (((day - 1) * 24 + hour) * 60 + minute) * 60 + second
+    timestamps = timestamps + (offset_s * 1_000_000 + micro).astype("timedelta64[us]")
+    return timestamps, valid
+
+
+def parse_export_timestamps(stamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bulk `parse_export_timestamp`: returns datetime64[us] values and a validity mask."""
+    return _parse_bulk(stamps, EXPORT_LAYOUT)
+
+
+def parse_stream_timestamps(stamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bulk `parse_stream_timestamp`: returns datetime64[us] values and a validity mask."""
+    return _parse_bulk(stamps, STREAM_LAYOUT)
@@ -0,0 +1,77 @@
+"""Price stream wire format.
+
+Binary frames (version 1, little endian, 28 bytes):
+
+    magic u8 (0xB7) | version u8 | ticks per point u16 | sequence u64 | timestamp i64 (epoch ns) | price i32 (ticks) | volume i32
+
+The timestamp is the naive exchange time, like the tick cache. Anything that doesn't
+start with the magic byte is treated as the legacy JSON message
+``{"LAST": "5600.25", "TIMESTAMP": "2025-03-14 09:30:00.123456"}``, so publishers can
+switch format independently of the subscribers.
+"""
+import json
+import struct
+from datetime import datetime, timedelta
+from typing import NamedTuple, Tuple, Union
+
+from tickr.core.timeparse import parse_stream_timestamp
+
+MAGIC = 0xB7
+VERSION = 1
+
+_FRAME = struct.Struct("<BBHQqii")
+FRAME_SIZE = _FRAME.size
+_EPOCH = datetime(1970, 1, 1)
+
+Payload = Union[bytes, bytearray, memoryview, str]
+
+
+class WireTick(NamedTuple):
+    tick: int              # price in instrument ticks
+    ticks_per_point: int
+    timestamp: datetime
+    sequence: int
+    volume: int
+
+    @property
+    def price(self) -> float:
+        return self.tick / self.ticks_per_point
+
+
+def encode_tick(sequence: int, timestamp: datetime, tick: int, ticks_per_point: int, volume: int = 0) -> bytes:
+    """Binary frame for one tick (publisher side)."""
+    delta = timestamp - _EPOCH
+    epoch_ns = ((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1_000
+    return _FRAME.pack(MAGIC, VERSION, ticks_per_point, sequence, epoch_ns, tick, volume)
+
+
+def encode_json(price: float, timestamp: datetime) -> str:
+    """Legacy JSON message, for publishers that still serve JSON subscribers."""
+    return json.dumps({"LAST": str(price), "TIMESTAMP": timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")})
+
+
+def is_binary(data: Payload) -> bool:
+    return not isinstance(data, str) and len(data) > 0 and data[0] == MAGIC
+
+
+def decode_tick(data: Payload) -> WireTick:
+    """Decode a binary frame; raises ValueError for an unknown version or a truncated frame."""
+    if len(data) != FRAME_SIZE:
+        raise ValueError(f"Binary price frame must be {FRAME_SIZE} bytes, got {len(data)}")
+    _, version, ticks_per_point, sequence, epoch_ns, tick, volume = _FRAME.unpack(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported price frame version {version}")
+    return WireTick(tick, ticks_per_point, _EPOCH + timedelta(microseconds=epoch_ns // 1_000), sequence, volume)
+
+
+def decode_json(data: Payload) -> Tuple[float, datetime]:
+    _data = json.loads(data)
+    return float(_data["LAST"]), parse_stream_timestamp(_data["TIMESTAMP"])
+
+
+def decode_price_message(data: Payload) -> Tuple[float, datetime]:
+    """Decode either format into (last price in points, tick timestamp)."""
+    if is_binary(data):
+        frame = decode_tick(data)
+        return frame.tick / frame.ticks_per_point, frame.timestamp
+    return decode_json(data)
@@ -2,6 +2,7 @@ import os
 from typing import Optional
 
 import redis
+import redis.asyncio
 from loguru import logger
 import signal
 from redis import Redis
@@ -21,13 +22,14 @@ def signal_handler(sig, frame):
     running = False
 
 
-def get_redis_client() -> Optional[RedisCluster]:
+def get_redis_client(decode_responses: bool = True) -> Optional[RedisCluster]:
+    """Cluster client; price stream subscribers pass decode_responses=False to receive binary frames."""
     try:
         r = RedisCluster(
             host=REDIS_HOST,
             port=REDIS_PORT,
             password=REDIS_PASSWORD,
-            decode_responses=True,
+            decode_responses=decode_responses,
             ssl=True
         )
         r.ping()
@@ -38,6 +40,23 @@ def get_redis_client() -> Optional[RedisCluster]:
         return None
 
 
+async def get_async_redis_client() -> redis.asyncio.Redis:
+    """asyncio client for the price stream; cluster PUBLISH is broadcast, so any node can serve subscriptions.
+
+    Responses are left as bytes so binary price frames arrive intact.
+    """
+    r = redis.asyncio.Redis(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        password=REDIS_PASSWORD,
+        decode_responses=False,
+        ssl=True
+    )
+    await r.ping()
+    logger.warning(f"✅ Connected to Redis at {REDIS_HOST}:{REDIS_PORT} successfully! (asyncio)")
+    return r
+
+
 def send_notification(client: RedisCluster, stream: str, event: str, notification: dict):
     _message = {
         "EVENT": event,
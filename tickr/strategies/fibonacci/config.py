@@ -1,10 +1,74 @@
 import json
-from datetime import time, datetime
-from pydantic import BaseModel
-from typing import List, Optional, Tuple
+from datetime import date, time, datetime, timedelta
+from pydantic import BaseModel, PrivateAttr
+from typing import Iterable, List, Optional, Tuple
 from rich import print
 import os
 
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+class TradingSchedule:
+    """Compiled trading sessions with a cached open/close transition.
+
+    Each (start, end) window is inclusive of both ends like before; a window with
+    start > end is an overnight session closing on the next day. Sessions whose
+    trade date (the day they close) is a holiday are skipped. `is_open` only
+    recomputes when a tick falls outside the cached [from, until) range.
+    """
+
+    def __init__(self, windows: Iterable[Tuple[time, time]], holidays: Iterable[date] = ()):
+        self.windows = list(windows)
+        self.holidays = set(holidays)
+        self._is_open = False
+        self._valid_from = datetime.max
+        self._valid_until = datetime.min
+
+    @property
+    def next_transition(self) -> datetime:
+        return self._valid_until
+
+    def sessions(self, first_day: date, last_day: date) -> List[Tuple[datetime, datetime]]:
+        """Merged half-open [open, close) sessions for trade dates in [first_day, last_day]."""
+        sessions = []
+        day = first_day
+        while day <= last_day:
+            if day not in self.holidays:
+                for start, end in self.windows:
+                    opening_day = day - timedelta(days=1) if start > end else day
+                    sessions.append((datetime.combine(opening_day, start), datetime.combine(day, end) + ONE_MICROSECOND))
+            day += timedelta(days=1)
+
+        merged: List[Tuple[datetime, datetime]] = []
+        for opens, closes in sorted(sessions):
+            if merged and opens <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], closes))
+            else:
+                merged.append((opens, closes))
+        return merged
+
+    def _refresh(self, timestamp: datetime) -> None:
+        today = timestamp.date()
+        # Sessions covering `timestamp` close today or tomorrow; look further ahead for the next open
+        for horizon in (7, 31, 366):
+            sessions = self.sessions(today - timedelta(days=1), today + timedelta(days=horizon))
+            previous_close = timestamp
+            for opens, closes in sessions:
+                if opens <= timestamp < closes:
+                    self._is_open, self._valid_from, self._valid_until = True, opens, closes
+                    return
+                if timestamp < opens:
+                    self._is_open, self._valid_from, self._valid_until = False, previous_close, opens
+                    return
+                previous_close = closes
+        self._is_open, self._valid_from, self._valid_until = False, timestamp, datetime.max
+
+    def is_open(self, timestamp: datetime) -> bool:
+        if self._valid_from <= timestamp < self._valid_until:
+            return self._is_open
+        self._refresh(timestamp)
+        return self._is_open
+
 class Connections(BaseModel):
     REDIS_HOST: Optional[str] = "redis"
     REDIS_PORT: Optional[int] = 6379
@@ -12,11 +76,19 @@ class Connections(BaseModel):
 
 class ConfigModel(BaseModel):
     ALLOWED_TIMES: List[Tuple[time, time]]
+    HOLIDAYS: List[date] = []
     CONNECTIONS: Connections
+    _schedule: Optional[TradingSchedule] = PrivateAttr(default=None)
+
+    def compile_schedule(self) -> TradingSchedule:
+        """Build a schedule with its own transition cache (one per price timeline)."""
+        return TradingSchedule(self.ALLOWED_TIMES, self.HOLIDAYS)
 
     def isWithinAllowableTradingWindow(self, priceTimestamp: datetime) -> bool:
-        """Check if the current time is within any of the allowed ranges."""
-        return any(start <= priceTimestamp.time() <= end for start, end in self.ALLOWED_TIMES)
+        """Check if the current time is within any of the allowed sessions."""
+        if self._schedule is None:
+            self._schedule = self.compile_schedule()
+        return self._schedule.is_open(priceTimestamp)
 
 
 CONFIG_FILE = os.getenv("CONFIG_FILE", "credentials.json")
@@ -0,0 +1,185 @@
+import contextlib
+import json
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, field_validator
+
+from nt8.client import NTClient
+from tickr.core.gateway import OrderGateway
+from tickr.core.hotlog import hotlog
+from tickr.core.startup import warm_up
+from tickr.strategies.RedisClient import get_redis_client
+from tickr.strategies.fibonacci.run import FibonacciTradingBot
+from utilities.latency import LATENCY, now_ns
+
+DEFAULT_FIBONACCI_RATIOS = [0, 0.23, 0.38, 0.50, 0.618, 0.78, 1.0, 1.23, 1.618, 2.14, 2.618, 3.618,
+                            -0.23, -0.618, -1.14, -1.618, -2.14, -2.618, -3.618]
+
+
+class HostedBotConfig(BaseModel):
+    """One strategy instance; defaults match the `production` command options."""
+    point_a: float
+    point_b: float
+    instrument: str
+    reactivation_distance: float
+    quantity: int = 2
+    take_profit: int = 15
+    stop_loss: int = 20
+    nt_account: str = "APEX2948580000003"
+    price_stream_channel: str = "NT8_ES_PRICESTREAM"
+    fibonacci_ratios: List[float] = DEFAULT_FIBONACCI_RATIOS
+    profit_threshold: Optional[float] = None
+    loss_threshold: Optional[float] = None  # positive number, like --loss-threshold
+
+
+class HostConfig(BaseModel):
+    logging_level: str = "INFO"
+    log_dir: Optional[str] = "logs"
+    log_sampling: Dict[str, int] = {}
+    journal_dir: Optional[str] = "journal"
+    bots: List[HostedBotConfig]
+
+    @field_validator("bots")
+    @classmethod
+    def at_least_one_bot(cls, bots: List[HostedBotConfig]) -> List[HostedBotConfig]:
+        if not bots:
+            raise ValueError("the host config needs at least one bot")
+        return bots
+
+
+def load_host_config(path: str) -> HostConfig:
+    with open(path, "r") as file:
+        return HostConfig(**json.load(file))
+
+
+class StrategyHost:
+    """Runs several `FibonacciTradingBot` instances in one process.
+
+    The bots share one NinjaTrader ATI connection and one Redis subscription; every
+    price message is dispatched to the bots listening on its channel, and each bot
+    decodes it as in `production` (own tick size, sequence gaps and latency stamps).
+    Each bot keeps its own levels, orders, positions and thresholds, and a bot that
+    fails is cancelled and detached without stopping the others.
+    """
+
+    def __init__(self, config: HostConfig):
+        self.created_at = time.perf_counter()
+        self.ntclient = NTClient()
+        # One worker thread serialises the orders of every bot onto the shared connection
+        self.gateway = OrderGateway(self.ntclient)
+        self.bots: List[FibonacciTradingBot] = []
+        self.routes: Dict[str, List[FibonacciTradingBot]] = defaultdict(list)
+        for bot_config in config.bots:
+            bot = FibonacciTradingBot(
+                point_a=bot_config.point_a,
+                point_b=bot_config.point_b,
+                instrument=bot_config.instrument,
+                quantity=bot_config.quantity,
+                take_profit=bot_config.take_profit,
+                stop_loss=bot_config.stop_loss,
+                reactivation_distance=bot_config.reactivation_distance,
+                nt_account=bot_config.nt_account,
+                price_stream_channel=bot_config.price_stream_channel,
+                fibonacci_ratios=bot_config.fibonacci_ratios,
+                is_backtest=False,
+                profit_threshold=bot_config.profit_threshold,
+                loss_threshold=bot_config.loss_threshold if bot_config.loss_threshold is None else -abs(bot_config.loss_threshold),
+                ntclient=self.ntclient,
+                gateway=self.gateway,
+                exit_on_threshold=False,
+                journal_dir=config.journal_dir,
+            )
+            self.bots.append(bot)
+            self.routes[bot.PRICE_STREAM_CHANNEL].append(bot)
+        self.client = None
+
+    def connect_redis(self):
+        self.client = get_redis_client(decode_responses=False)
+        if self.client is None:
+            raise ConnectionError("cannot connect to Redis")
+
+    def warm_up(self, timeout: float = 30.0):
+        """Connect NinjaTrader and Redis and generate every bot's ATM template concurrently."""
+        tasks = {"ninjatrader": self.bots[0].connect_ninjatrader, "redis": self.connect_redis}
+        for bot in self.bots:
+            key = f"{bot.TP}_{bot.SL}"
+            tasks.setdefault(f"atm template {key} {bot.INSTRUMENT}", lambda key=key, instrument=bot.INSTRUMENT: self.gateway.template(key, instrument))
+        durations = warm_up(tasks, timeout=timeout)
+        for bot in self.bots:
+            if bot.recovered_orders is not None:
+                bot.reconcile_orders()
+        logger.success(f"Host ready in {time.perf_counter() - self.created_at:.2f}s "
+                       f"(slowest: {max(durations, key=durations.get)} {max(durations.values()):.2f}s)")
+
+    def is_running(self) -> bool:
+        return any(not bot.threshold_reached for bots in self.routes.values() for bot in bots)
+
+    def detach(self, bot: FibonacciTradingBot) -> None:
+        """Stop routing prices to a bot and cancel its orders."""
+        bots = self.routes.get(bot.PRICE_STREAM_CHANNEL, [])
+        if bot in bots:
+            bots.remove(bot)
+        with contextlib.suppress(Exception):
+            bot.cancel_all_orders()
+
+    def dispatch(self, channel, data) -> None:
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        bots = self.routes.get(channel)
+        if not bots:
+            return
+        for bot in list(bots):
+            # A malformed message fails the first bot's decode and is skipped by run()
+            LATENCY.tick_received_ns = received = now_ns()
+            current_tick, tick_timestamp = bot.decode_price_message(data)
+            LATENCY.record("decode", received)
+            try:
+                bot.process_tick(current_tick, tick_timestamp=tick_timestamp)
+            except Exception as e:
+                logger.error(f"{bot.INSTRUMENT} ({bot.POINT_A}/{bot.POINT_B}) failed on {channel}: {e}. Detaching bot")
+                self.detach(bot)
+
+    def run(self):
+        if self.client is None:
+            self.connect_redis()
+        pubsub = self.client.pubsub()
+        pubsub.subscribe(*self.routes)
+        logger.debug(f"Hosting {len(self.bots)} bots on channels: {', '.join(self.routes)}")
+        for bot in self.bots:
+            bot.reporter.start()
+        stopped = False
+        try:
+            while self.is_running():
+                message = pubsub.get_message(timeout=1)
+                if message and message["type"] == "message":
+                    try:
+                        self.dispatch(message["channel"], message["data"])
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.error(f"Skipping malformed price message on {message['channel']}: {e}")
+            logger.warning("Every hosted bot reached its threshold")
+            stopped = True
+        except KeyboardInterrupt:
+            stopped = True
+            logger.warning("Interrupted, stopping the host")
+        except Exception as e:
+            logger.error(f"Error occurred: {e}")
+        finally:
+            logger.error("Host price streaming loop stopped. Cancelling all orders")
+            cancelled = {}
+            for bot in self.bots:
+                cancelled[bot] = bot.cancel_on_shutdown()
+                bot.reporter.stop()
+            pubsub.close()
+            self.client.close()
+            self.gateway.stop()
+            for bot in self.bots:
+                bot.handle_order_events()
+                # A bot detached after an error keeps its journal
+                attached = bot in self.routes.get(bot.PRICE_STREAM_CHANNEL, [])
+                bot.close_journal(clean=cancelled[bot] and stopped and attached)
+            self.ntclient.Dispose()
+            hotlog.stop()
+            logger.success("Host closed.")
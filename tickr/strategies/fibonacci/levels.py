@@ -0,0 +1,112 @@
+from bisect import bisect_left, bisect_right, insort
+from math import inf
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+
+class LevelIndex:
+    """Price-sorted view of inactive Fibonacci levels and pending orders.
+
+    Entries are kept sorted by price so that a tick only touches the levels that
+    lie between the previous and the current price (pending order crossings) or
+    that just left the reactivation band. Results are returned in the original
+    ratio / placement order so the strategy behaves exactly as a full scan would.
+    Prices are integer instrument ticks.
+    """
+
+    def __init__(self, fib_levels: Dict[float, int]):
+        self.fib_levels = fib_levels
+        # Position of every ratio in the configured list, used to restore scan order
+        self._rank = {ratio: rank for rank, ratio in enumerate(fib_levels)}
+        self._inactive: List[Tuple[int, int, float]] = sorted(
+            (price, self._rank[ratio], ratio) for ratio, price in fib_levels.items()
+        )
+        self._pending: List[Tuple[int, int, str]] = []
+        self._pending_seq = 0
+        # Nearest pending prices strictly below/above the last empty crossing range
+        self._pending_below = -inf
+        self._pending_above = inf
+
+    # Levels
+    def deactivate(self, ratio: float) -> None:
+        """Put a level back into the reactivation watch list."""
+        insort(self._inactive, (self.fib_levels[ratio], self._rank[ratio], ratio))
+
+    def activate(self, ratio: float) -> None:
+        """Take a level out of the reactivation watch list (when restoring an active level)."""
+        entry = (self.fib_levels[ratio], self._rank[ratio], ratio)
+        idx = bisect_left(self._inactive, entry)
+        if idx < len(self._inactive) and self._inactive[idx] == entry:
+            del self._inactive[idx]
+
+    def levels_to_reactivate(self, low: int, high: int, distance: int) -> List[float]:
+        """Pop inactive levels at least `distance` away from some price in [low, high] (low == high for one tick)."""
+        inactive = self._inactive
+        if not inactive:
+            return []
+        lower, upper = high - distance, low + distance
+        if inactive[0][0] > lower and inactive[-1][0] < upper:
+            return []
+
+        below = bisect_right(inactive, (lower, inf))
+        above = bisect_left(inactive, (upper,))
+        if below >= above:
+            hits, self._inactive = inactive, []
+        else:
+            hits = inactive[:below] + inactive[above:]
+            self._inactive = inactive[below:above]
+        return [ratio for _, _, ratio in sorted(hits, key=itemgetter(1))]
+
+    # Pending orders
+    def add_pending(self, order_id: str, price: int) -> None:
+        self._pending_seq += 1
+        insort(self._pending, (price, self._pending_seq, order_id))
+        if self._pending_below < price < self._pending_above:
+            self._pending_below = inf
+
+    def remove_pending(self, order_id: str, price: int) -> None:
+        pending = self._pending
+        idx = bisect_left(pending, (price,))
+        while idx < len(pending) and pending[idx][0] == price:
+            if pending[idx][2] == order_id:
+                del pending[idx]
+                return
+            idx += 1
+
+    def clear_pending(self) -> None:
+        self._pending.clear()
+        self._pending_below = -inf
+        self._pending_above = inf
+
+    def pending_in_range(self, low: int, high: int) -> List[str]:
+        """Order ids of pending orders priced within [low, high], in placement order."""
+        if self._pending_below < low and high < self._pending_above:
+            return []
+
+        pending = self._pending
+        start = bisect_left(pending, (low,))
+        end = bisect_right(pending, (high, inf))
+        if start == end:
+            self._pending_below = pending[start - 1][0] if start else -inf
+            self._pending_above = pending[end][0] if end < len(pending) else inf
+            return []
+
+        # Matches may stay pending (e.g. outside the trading window), so don't cache a band
+        self._pending_below = inf
+        return [order_id for _, _, order_id in sorted(pending[start:end], key=itemgetter(1))]
+
+    def nearest_pending(self, price: int) -> Tuple[float, float]:
+        """Closest pending prices at-or-below and at-or-above `price` (±inf when there is none)."""
+        pending = self._pending
+        idx = bisect_left(pending, (price,))
+        above = pending[idx][0] if idx < len(pending) else inf
+        if above == price:
+            return price, price
+        below = pending[idx - 1][0] if idx else -inf
+        return below, above
+
+    def inactive_bounds(self) -> Tuple[float, float]:
+        """Lowest and highest inactive level prices (inf/-inf when every level is active)."""
+        if not self._inactive:
+            return inf, -inf
+        return self._inactive[0][0], self._inactive[-1][0]
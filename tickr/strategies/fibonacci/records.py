@@ -0,0 +1,115 @@
+import time
+from datetime import datetime
+
+from tickr.strategies.fibonacci.schemas import PendingOrderInventory, PositionClose, PositionOpen
+
+
+# Raw tick timestamps; stored as strings in the state journal
+_TIMESTAMP_FIELDS = {"generatedAt", "positionEntryTime", "positionClosingTime"}
+
+
+def _system_time(timestamp: float) -> str:
+    return str(datetime.fromtimestamp(timestamp))
+
+
+def to_row(record) -> list:
+    """Slot values of a pending/open position record, in slot order (for the state journal)."""
+    return [getattr(record, name) for name in record.__slots__]
+
+
+def from_row(cls, row: list):
+    """Rebuild a record from `to_row()` output (timestamps may come back as strings)."""
+    record = cls.__new__(cls)
+    for name, value in zip(cls.__slots__, row):
+        if name in _TIMESTAMP_FIELDS and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        setattr(record, name, value)
+    return record
+
+
+class PendingOrderRecord:
+    """Engine-side pending order; `to_model()` builds the pydantic schema on demand."""
+
+    __slots__ = (
+        "orderId", "instrument", "orderType", "price", "fibRatioLevel",
+        "takeProfit", "stopLoss", "generatedAt", "systemTimeStamp",
+    )
+
+    def __init__(self, orderId, instrument, orderType, price, fibRatioLevel, takeProfit, stopLoss, generatedAt):
+        self.orderId = orderId
+        self.instrument = instrument
+        self.orderType = orderType
+        self.price = price
+        self.fibRatioLevel = fibRatioLevel
+        self.takeProfit = takeProfit
+        self.stopLoss = stopLoss
+        self.generatedAt = generatedAt  # raw tick timestamp
+        self.systemTimeStamp = time.time()
+
+    def to_model(self) -> PendingOrderInventory:
+        return PendingOrderInventory(
+            orderId=self.orderId,
+            instrument=self.instrument,
+            orderType=self.orderType,
+            price=self.price,
+            fibRatioLevel=self.fibRatioLevel,
+            takeProfit=self.takeProfit,
+            stopLoss=self.stopLoss,
+            generatedAt=str(self.generatedAt),
+            systemTimeStamp=_system_time(self.systemTimeStamp),
+        )
+
+
+class OpenPositionRecord:
+    """Engine-side open position; `to_model()` builds the pydantic schema on demand."""
+
+    __slots__ = (
+        "instrument", "fibRatioLevel", "positionType", "positionEntryPrice",
+        "positionEntryTime", "systemTimeStamp", "takeProfit", "stopLoss",
+    )
+
+    def __init__(self, instrument, fibRatioLevel, positionType, positionEntryPrice, positionEntryTime, takeProfit, stopLoss):
+        self.instrument = instrument
+        self.fibRatioLevel = fibRatioLevel
+        self.positionType = positionType
+        self.positionEntryPrice = positionEntryPrice
+        self.positionEntryTime = positionEntryTime  # raw tick timestamp
+        self.systemTimeStamp = time.time()
+        self.takeProfit = takeProfit
+        self.stopLoss = stopLoss
+
+    def to_model(self) -> PositionOpen:
+        return PositionOpen(
+            instrument=self.instrument,
+            fibRatioLevel=self.fibRatioLevel,
+            positionType=self.positionType,
+            positionEntryPrice=self.positionEntryPrice,
+            positionEntryTime=str(self.positionEntryTime),
+            systemTimeStamp=_system_time(self.systemTimeStamp),
+            takeProfit=self.takeProfit,
+            stopLoss=self.stopLoss,
+        )
+
+
+class ClosedPositionRecord:
+    """Engine-side closed position; `to_model()` builds the pydantic schema on demand."""
+
+    __slots__ = ("metadata", "positionClosingPrice", "positionClosingTime", "systemTimeStamp", "outcome", "net")
+
+    def __init__(self, metadata: OpenPositionRecord, positionClosingPrice, positionClosingTime, outcome, net):
+        self.metadata = metadata
+        self.positionClosingPrice = positionClosingPrice
+        self.positionClosingTime = positionClosingTime  # raw tick timestamp
+        self.systemTimeStamp = time.time()
+        self.outcome = outcome
+        self.net = net
+
+    def to_model(self) -> PositionClose:
+        return PositionClose(
+            metadata=self.metadata.to_model(),
+            positionClosingPrice=self.positionClosingPrice,
+            positionClosingTime=str(self.positionClosingTime),
+            systemTimeStamp=_system_time(self.systemTimeStamp),
+            outcome=self.outcome,
+            net=self.net,
+        )
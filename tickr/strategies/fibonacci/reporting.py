@@ -1,7 +1,11 @@
-from typing import List
+import queue
+import threading
+from typing import List, Optional
 from tickr.strategies.fibonacci.schemas import PositionClose
+from tickr.strategies.fibonacci.stats import TradeStats
 from rich import print
 from tabulate import tabulate
+from termcolor import cprint
 
 def print_position_close_table(position_closes: List[PositionClose]) -> None:
     """Prints a tabulate table from a list of PositionClose objects."""
@@ -24,25 +28,74 @@ def print_position_close_table(position_closes: List[PositionClose]) -> None:
     print(tabulate(table_data, headers=headers, tablefmt="simple_grid"))
 
 
-def print_position_summary_table(closed_positions: List[PositionClose]) -> None:
-    """Prints a summary table with profit/loss counts and total price."""
+def print_position_summary_table(stats: TradeStats) -> None:
+    """Prints the summary table (counts, totals, drawdown, per side) from the running statistics."""
+    print(tabulate(stats.rows(), headers=["Metric", "Value"], tablefmt="simple_grid"))
 
-    num_profits = 0
-    num_losses = 0
-    total_net = 0
+class PositionReporter:
+    """Console output for position closes, kept off the tick path.
 
-    for pc in closed_positions:
-        if pc.outcome == 'PROFIT':
-            num_profits += 1
-        elif pc.outcome == 'LOSS':
-            num_losses += 1
-        total_net += pc.net  # Assuming you want to sum entry prices
+    `position_closed` only queues the close. The queue is rendered (one line plus the
+    record per close, then a single P&L summary read from `stats`) every `interval`
+    seconds by a daemon thread once `start()` is called, and whatever is left when
+    `stop()` is called. A quiet reporter drops every event, so backtests can run
+    without console output.
+    """
 
-    headers = ["Metric", "Value"]
-    table_data = [
-        ["Number of Profits", num_profits],
-        ["Number of Losses", num_losses],
-        ["Total Net Result", total_net]
-    ]
+    def __init__(self, stats: TradeStats, quiet: bool = False, interval: float = 1.0, name: str = ""):
+        self.stats = stats
+        self.quiet = quiet
+        self.interval = interval
+        self.name = name
+        self.events: queue.SimpleQueue = queue.SimpleQueue()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
 
-    print(tabulate(table_data, headers=headers, tablefmt="simple_grid"))
+    def position_closed(self, closed_position) -> None:
+        if not self.quiet:
+            self.events.put(closed_position)
+
+    def render(self) -> None:
+        """Print every queued close and, if there were any, the running P&L summary."""
+        with self._lock:
+            rendered = 0
+            while True:
+                try:
+                    closed_position = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                rendered += 1
+                highlighted_message_color = "on_green" if closed_position.outcome == "PROFIT" else "on_red"
+                cprint(f"{closed_position.positionClosingTime}: Position closed/flatten at {closed_position.positionClosingPrice}"
+                       f" - {closed_position.outcome}: {closed_position.net}", "black", highlighted_message_color)
+                print(closed_position.to_model())
+            if rendered:
+                self.print_pnl_summary()
+
+    def print_pnl_summary(self) -> None:
+        stats = self.stats
+        cprint(f"\n{self.name + ' ' if self.name else ''}Current Total P&L: {stats.equity:+.2f}", "black", "on_white")
+        print(f"Number of Closed Positions: {stats.trades}")
+        if stats.trades:
+            print(f"Win Rate: {stats.win_rate:.1f}% ({stats.wins}/{stats.trades})"
+                  f" | Expectancy: {stats.expectancy:+.2f} | Max Drawdown: {stats.max_drawdown:.2f}")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.render()
+
+    def start(self) -> None:
+        if self.quiet or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="position-reporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the timer thread and render what is still queued."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        self.render()
@@ -6,35 +6,56 @@ from datetime import datetime, date
 import time
 import os
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import redis
 import json
-from termcolor import colored, cprint
+import concurrent.futures
+import queue
+import re
 import uuid
-from nt8.client import NTClient
+from math import ceil
+from nt8.client import FINAL_ORDER_STATUSES, NTClient, is_flat
 from nt8.enums import OrderTypes, ActionTypes
 from core.order import Order
-from tqdm import tqdm
 
 from tickr.strategies.fibonacci.config import settings
-from tickr.strategies.fibonacci.schemas import PendingOrderInventory, PositionClose, PositionOpen
-from tickr.strategies.fibonacci.reporting import print_position_close_table, print_position_summary_table
+from tickr.strategies.fibonacci.levels import LevelIndex
+from tickr.strategies.fibonacci.triggers import TriggerBook
+from tickr.strategies.fibonacci.vectorized import VectorizedBacktest
+from tickr.strategies.fibonacci.sweep import parse_range, parse_tick_range, print_sweep_table, run_sweep
+from tickr.strategies.fibonacci.stats import TradeStats
+from tickr.strategies.fibonacci.records import ClosedPositionRecord, OpenPositionRecord, PendingOrderRecord, from_row, to_row
+from tickr.strategies.fibonacci.reporting import PositionReporter, print_position_close_table, print_position_summary_table
 from loguru import logger
-from tickr.strategies.RedisClient import get_redis_client
+from tickr.strategies.RedisClient import get_async_redis_client, get_redis_client
 from tabulate import tabulate
 from tickr.strategies.utils import timeit
 import typer
-from utilities.helper import (
-    generate_strategy,
-)
+import asyncio
+from tickr.core.conflation import conflate
+from tickr.core.gateway import PLACED, REJECTED, CANCELLED, OrderGateway, OrderHandle
+from tickr.core.hotlog import configure_logging, hotlog, parse_sampling
+from tickr.core.ingest import PriceIngestor, QueuedMessage
+from tickr.core.journal import Journal
+from tickr.core.startup import StartupError, warm_up
+from tickr.core.tickcache import build_tick_cache, cache_dir_for
+from tickr.core.timeparse import parse_export_timestamp
+from tickr.core.wire import decode_json, decode_tick, is_binary
+from utilities.helper import TICK_TO_POINT
+from utilities.latency import LATENCY, now_ns
 
 app = typer.Typer()
 
+# Seconds between latency histogram reports in production
+LATENCY_REPORT_INTERVAL = 300
 
-def round_to_nearest_quarter(value):
-    return round(value * 4) / 4
 
-def calculate_fib_levels(point_a, point_b, ratios):
+def to_ticks(price: float, ticks_per_point: int) -> int:
+    """Convert a price in points to integer instrument ticks (nearest tick)."""
+    return int(round(price * ticks_per_point))
+
+def calculate_fib_levels(point_a, point_b, ratios, ticks_per_point: int = 4):
+    """Fibonacci level of every ratio, in integer ticks (rounded to the nearest tick)"""
     # Calculate the difference between Point A and Point B
     difference = point_a - point_b
 
@@ -46,8 +67,8 @@ def calculate_fib_levels(point_a, point_b, ratios):
         else:
             level = point_b - (difference * abs(ratio))
 
-        # Round the level to the nearest 0.25 increment
-        fib_levels[ratio] = round_to_nearest_quarter(level)
+        # Round the level to the nearest tick (0.25 for ES/NQ)
+        fib_levels[ratio] = to_ticks(level, ticks_per_point)
 
     return fib_levels
 
@@ -77,16 +98,19 @@ class FibonacciTradingBot:
         nt_account: str,
         price_stream_channel: str,
         fibonacci_ratios: List[float],
-        logging_level: str = "INFO",
         is_backtest: bool = False,
         profit_threshold: float = None,
         loss_threshold: float = None,
-        log_file: str = f"trades/logs.{datetime.now()}.csv"
+        log_file: str = f"trades/logs.{datetime.now()}.csv",
+        ntclient: Optional[NTClient] = None,
+        exit_on_threshold: bool = True,
+        quiet: bool = False,
+        gateway: Optional[OrderGateway] = None,
+        journal_dir: Optional[str] = None
     ):
-        # Set logging level
-        logger.remove()
-        logger.add(sys.stderr, level=logging_level)
-        
+        # Startup time is reported from here to the end of warm_up()
+        self.created_at = time.perf_counter()
+
         # Initialize with provided points
         self.POINT_A = point_a
         self.POINT_B = point_b
@@ -101,29 +125,73 @@ class FibonacciTradingBot:
         self.profit_threshold = profit_threshold
         self.loss_threshold = loss_threshold
         self.threshold_reached = False  # New flag to track if threshold is reached
+        # Hosted bots share the process, so reaching a threshold only stops this bot
+        self.exit_on_threshold = exit_on_threshold
         
         if self.POINT_A is None or self.POINT_B is None:
             raise ValueError("Point A and Point B must be provided")
-            
-        self.fib_levels = calculate_fib_levels(
+
+        # All strategy arithmetic runs on integer ticks; points are only used for orders and reporting
+        self.TICKS_PER_POINT = TICK_TO_POINT[instrument.split(" ")[0]]
+        self.TP_TICKS = to_ticks(take_profit, self.TICKS_PER_POINT)
+        self.SL_TICKS = to_ticks(stop_loss, self.TICKS_PER_POINT)
+        # Levels reactivate once at least this many ticks away from the price
+        self.REACTIVATION_TICKS = ceil(round(reactivation_distance * self.TICKS_PER_POINT, 9))
+
+        self.fib_level_ticks = calculate_fib_levels(
             point_a=self.POINT_A,
             point_b=self.POINT_B,
-            ratios=fibonacci_ratios
+            ratios=[float(ratio) for ratio in fibonacci_ratios],
+            ticks_per_point=self.TICKS_PER_POINT
         )
+        self.fib_levels = {ratio: self.to_points(ticks) for ratio, ticks in self.fib_level_ticks.items()}
         self.isTradingZoneActive = False
+        self.trading_schedule = settings.compile_schedule()
         self.client: Optional[RedisCluster] = None
-        self.ntclient = NTClient()
+        # Set by production_async; exposes queue depth and drop/lag counters
+        self.ingestor: Optional[PriceIngestor] = None
+        # Backlogs longer than this are merged into min/max/last updates (0 disables conflation)
+        self.conflation_depth = 0
+        self.conflated_ticks = 0
+        # Binary price frames carry a sequence number; gaps mean ticks were lost upstream
+        self.last_sequence: Optional[int] = None
+        self.sequence_gaps = 0
+        self.tick_latency = LATENCY.histogram("process_tick")
+        # The NinjaTrader connection can be shared by several bots running in one process
+        self.ntclient = ntclient if ntclient is not None else NTClient()
+        # Orders are sent by the gateway's worker thread (shared with the connection when hosted);
+        # backtests use a dry-run gateway that never touches NinjaTrader
+        self.gateway = gateway if gateway is not None else OrderGateway(self.ntclient, dry_run=is_backtest)
+        self.order_events: queue.SimpleQueue = queue.SimpleQueue()
 
         self.active_levels = {level: False for level in self.fib_levels}
-        self.last_price = None
+        self.level_index = LevelIndex(self.fib_level_ticks)
+        self.last_tick: Optional[int] = None
         self.log_file = log_file
-        self.open_positions: List[PositionOpen] = []
-        self.closed_positions: List[PositionClose] = []
-        self.internal_pending_orders_inventory: List[PendingOrderInventory] = []
-        self.orders_placed_ninjatrader: List[Order] = []
-        self.order_to_position_map: dict = {}
-        self.total_pnl = 0.0
-        
+        # Open positions keyed by the id of the pending order that opened them
+        self.open_positions: Dict[str, OpenPositionRecord] = {}
+        self.trigger_book = TriggerBook()
+        self.closed_positions: List[ClosedPositionRecord] = []
+        self.internal_pending_orders_inventory: Dict[str, PendingOrderRecord] = {}
+        self.orders_placed_ninjatrader: List[OrderHandle] = []
+        # Win/loss, equity and drawdown statistics, updated on every close
+        self.stats = TradeStats()
+        # Position closes are rendered by the reporter (timer thread in production, end of run in backtests)
+        self.quiet = quiet
+        self.reporter = PositionReporter(self.stats, quiet=quiet, name=self.INSTRUMENT)
+        # Crash recovery: state transitions are journaled (production only) and replayed on restart
+        self.journal: Optional[Journal] = None
+        self.cancelling: List[Tuple[OrderHandle, Optional[PendingOrderRecord]]] = []
+        # NinjaTrader orders known from the journal, keyed by pending order id; reconciled after connecting
+        self.recovered_orders: Optional[Dict[str, list]] = None
+        if journal_dir and not is_backtest:
+            self.open_journal(journal_dir)
+
+        if not quiet:
+            self.print_configuration()
+        logger.success("Bot initialized and ready to process price stream")
+
+    def print_configuration(self):
         # Print initial setup using tabulate
         print("\nFibonacci Trading Bot Configuration")
         print("=" * 50)
@@ -147,94 +215,136 @@ class FibonacciTradingBot:
         print("=" * 50)
         fib_data = [[ratio, price] for ratio, price in self.fib_levels.items()]
         print(tabulate(fib_data, headers=["Ratio", "Price Level"], tablefmt="simple_grid"))
-        
-        logger.success("Bot initialized and ready to process price stream")
 
-    def place_order_on_ninjatrader(self, order_type: str, price: float, tick_timestamp: datetime):
-        """Place an order directly with NinjaTrader"""
+    def to_points(self, ticks: int) -> float:
+        return ticks / self.TICKS_PER_POINT
+
+    def place_order_on_ninjatrader(self, order_type: str, price: float, tick_timestamp: datetime, reference: Optional[str] = None):
+        """Hand an order to the gateway; returns its handle without waiting for NinjaTrader"""
         if not self.isTradingZoneActive:
-            logger.warning(f"{tick_timestamp}: Skipping NinjaTrader order placement - outside trading window")
-            return None
-            
-        try:
-            action = order_type
-            atm_strategy_key = f"{self.TP}_{self.SL}"
-            atm_strategy = generate_strategy(atm_strategy_key, self.INSTRUMENT)
-            order = Order(
-                instrument_name=self.INSTRUMENT,
-                action=action,
-                quantity=self.QUANTITY,
-                price=price,
-                strategy=atm_strategy
-            )
-            
-            # Only place actual NinjaTrader orders in production mode
-            if not self.is_backtest:
-                order.place(self.ntclient, self.NT_ACCOUNT)
-                logger.success(f"{tick_timestamp}: Placed {order_type} order on NinjaTrader at price: {price}")
-            else:
-                logger.info(f"{tick_timestamp}: [BACKTEST] Would place {order_type} order on NinjaTrader at price: {price}")
-                
-            self.orders_placed_ninjatrader.append(order)
-            return order
-        except Exception as e:
-            logger.error(f"Error placing NinjaTrader order: {e}")
+            hotlog.warning("order", "{}: Skipping NinjaTrader order placement - outside trading window", tick_timestamp)
             return None
 
-    def cancel_all_orders(self):
-        """Cancel all active orders"""
-        for order in self.orders_placed_ninjatrader:
-            try:
-                if not self.is_backtest:
-                    order.cancel(self.ntclient, self.NT_ACCOUNT)
-                    logger.warning(f"Cancelled order on NinjaTrader")
-                else:
-                    logger.info("[BACKTEST] Would cancel order on NinjaTrader")
-            except Exception as e:
-                logger.error(f"Error cancelling order: {e}")
+        handle = self.gateway.place(
+            instrument=self.INSTRUMENT,
+            account=self.NT_ACCOUNT,
+            action=order_type,
+            quantity=self.QUANTITY,
+            price=price,
+            template_key=f"{self.TP}_{self.SL}",
+            tick_timestamp=tick_timestamp,
+            events=self.order_events,
+            reference=reference,
+        )
+        if self.is_backtest:
+            hotlog.info("order", "{}: [BACKTEST] Would place {} order on NinjaTrader at price: {}", tick_timestamp, order_type, price)
+        else:
+            hotlog.info("order", "{}: Queued {} order for NinjaTrader at price: {}", tick_timestamp, order_type, price)
+        self.orders_placed_ninjatrader.append(handle)
+        return handle
+
+    def handle_order_events(self):
+        """Log acknowledgements from the order gateway (runs on the tick thread)"""
+        for event in OrderGateway.poll_events(self.order_events):
+            handle = event.handle
+            if event.status == PLACED:
+                if self.journal is not None:
+                    order = handle.order
+                    self.journal.append("nt_order", [handle.reference, order.id, order.oco_id, order.strategy, handle.instrument,
+                                                     handle.account, handle.action, handle.quantity, handle.price])
+                hotlog.success("order", "{}: Placed {} order on NinjaTrader at price: {}", handle.tick_timestamp, handle.action, handle.price)
+            elif event.status == REJECTED:
+                logger.error(f"{handle.tick_timestamp}: Error placing NinjaTrader {handle.action} order at {handle.price} "
+                             f"after {handle.attempts} attempts: {event.error}")
+                if handle in self.orders_placed_ninjatrader:
+                    self.orders_placed_ninjatrader.remove(handle)
+                self.drop_rejected_order(handle.reference, handle.tick_timestamp)
+            elif event.status == CANCELLED:
+                hotlog.warning("order", "Cancelled {} order at {} on NinjaTrader", handle.action, handle.price)
+            elif event.error:
+                logger.error(f"Error cancelling order: {event.error}")
+
+    def drop_rejected_order(self, order_id: str, tick_timestamp):
+        """Forget a pending order NinjaTrader never accepted; its level waits for reactivation as after a fill"""
+        pending_order = self.internal_pending_orders_inventory.pop(order_id, None)
+        if pending_order is None:
+            return  # already filled or cancelled
+        level = pending_order.fibRatioLevel
+        self.level_index.remove_pending(order_id, self.fib_level_ticks[level])
+        if self.active_levels[level]:
+            self.active_levels[level] = False
+            self.level_index.deactivate(level)
+        if self.journal is not None:
+            self.journal.append("rejected", order_id)
+            self.journal.append("level", level, False)
+        hotlog.warning("order", "{}: Dropped rejected {} order at ratio: {} - waiting for reactivation",
+                       tick_timestamp, pending_order.orderType, level)
+
+    def cancel_all_orders(self) -> List[Tuple[OrderHandle, Optional[PendingOrderRecord]]]:
+        """Cancel all active orders; returns their handles with the pending orders they were placed for"""
+        cancelled = [(handle, self.internal_pending_orders_inventory.get(handle.reference))
+                     for handle in self.orders_placed_ninjatrader]
+        # Kept until shutdown, which checks that every cancel went through
+        self.cancelling = [(handle, order) for handle, order in self.cancelling if handle.status == PLACED] + cancelled
+        for handle in self.orders_placed_ninjatrader:
+            self.gateway.cancel(handle)
+            if self.is_backtest:
+                hotlog.info("order", "[BACKTEST] Would cancel order on NinjaTrader")
         self.orders_placed_ninjatrader.clear()
         self.internal_pending_orders_inventory.clear()
-        logger.warning("All active orders cancelled")
+        self.level_index.clear_pending()
+        if self.journal is not None:
+            self.journal.append("cancel_all")
+        hotlog.warning("order", "All active orders cancelled")
+        return cancelled
 
-    def enter_position(self, level, positionType, price, tick_timestamp, order_id: str):
+    def enter_position(self, level, positionType, tick: int, tick_timestamp, order_id: str):
         """Enter a position when a pending order is hit"""
-        self.active_levels[level] = False
-        logger.warning(f"{tick_timestamp}: Deactivated ratio. {level} until (`price > {price + self.REACTIVATION_DISTANCE}` OR `price < {price - self.REACTIVATION_DISTANCE}`)")
+        price = self.to_points(tick)
+        if self.active_levels[level]:
+            self.active_levels[level] = False
+            self.level_index.deactivate(level)
+            if self.journal is not None:
+                self.journal.append("level", level, False)
+        hotlog.warning("entry", "{}: Deactivated ratio. {} until (`price > {}` OR `price < {}`)",
+                       tick_timestamp, level, price + self.REACTIVATION_DISTANCE, price - self.REACTIVATION_DISTANCE)
 
         if self.isTradingZoneActive:
-            logger.success(f"{tick_timestamp}: Entering {positionType} position at ratio:{level} - Price:{price}")
+            hotlog.success("entry", "{}: Entering {} position at ratio:{} - Price:{}", tick_timestamp, positionType, level, price)
             if positionType == "LONG":
-                positionTakeProfit = price + self.TP
-                positionStopLoss = price - self.SL
+                take_profit_tick = tick + self.TP_TICKS
+                stop_loss_tick = tick - self.SL_TICKS
             elif positionType == "SHORT":
-                positionTakeProfit = price - self.TP
-                positionStopLoss = price + self.SL
+                take_profit_tick = tick - self.TP_TICKS
+                stop_loss_tick = tick + self.SL_TICKS
             
             # Create open position
-            open_position = PositionOpen(
+            open_position = OpenPositionRecord(
                 instrument = self.INSTRUMENT,
                 fibRatioLevel = level,
                 positionType = positionType,
                 positionEntryPrice = price,
-                positionEntryTime = str(tick_timestamp),
-                systemTimeStamp = str(datetime.now()),
-                takeProfit = positionTakeProfit,
-                stopLoss = positionStopLoss
+                positionEntryTime = tick_timestamp,
+                takeProfit = self.to_points(take_profit_tick),
+                stopLoss = self.to_points(stop_loss_tick)
             )
-            self.open_positions.append(open_position)
-            
-            # Map the order to the position
-            self.order_to_position_map[order_id] = open_position            # Remove the pending order that was hit
-            self.internal_pending_orders_inventory = [order for order in self.internal_pending_orders_inventory if order.orderId != order_id]
+            self.open_positions[order_id] = open_position
+            self.trigger_book.add(order_id, positionType, take_profit_tick, stop_loss_tick)
+
+            # Remove the pending order that was hit
+            pending_order = self.internal_pending_orders_inventory.pop(order_id)
+            self.level_index.remove_pending(order_id, self.fib_level_ticks[pending_order.fibRatioLevel])
+            if self.journal is not None:
+                self.journal.append("open", order_id, to_row(open_position))
         else:
-            logger.debug(f"{tick_timestamp}: Position Entry void at level: {level} - Outside trading window zone")
+            hotlog.debug("entry", "{}: Position Entry void at level: {} - Outside trading window zone", tick_timestamp, level)
 
     def generate_pending_orders(self, order_type, fib_level, fib_level_price, tick_timestamp):
         if not self.isTradingZoneActive:
-            logger.debug(f"{tick_timestamp}: Skipping pending order generation - outside trading window")
+            hotlog.debug("pending", "{}: Skipping pending order generation - outside trading window", tick_timestamp)
             return
             
-        logger.debug(f"{tick_timestamp}: Placed Pending Order: {order_type} at price: {fib_level_price}")
+        hotlog.debug("pending", "{}: Placed Pending Order: {} at price: {}", tick_timestamp, order_type, fib_level_price)
         if order_type == "BUY":
             takeProfit = fib_level_price + self.TP
             stopLoss = fib_level_price - self.SL
@@ -242,10 +352,10 @@ class FibonacciTradingBot:
             takeProfit = fib_level_price - self.TP
             stopLoss = fib_level_price + self.SL
                 # Place the order directly
-        order: Optional[Order] = self.place_order_on_ninjatrader(order_type, fib_level_price, tick_timestamp)
+        order_id = str(uuid.uuid4())
+        order: Optional[OrderHandle] = self.place_order_on_ninjatrader(order_type, fib_level_price, tick_timestamp, reference=order_id)
         if order:
-            order_id = str(uuid.uuid4())
-            pendingOrderGenerated = PendingOrderInventory(
+            pendingOrderGenerated = PendingOrderRecord(
                 orderId=order_id,  # Use the generated order ID
                 instrument=self.INSTRUMENT,
                 orderType=order_type,
@@ -253,166 +363,624 @@ class FibonacciTradingBot:
                 fibRatioLevel=fib_level,
                 takeProfit=takeProfit,
                 stopLoss=stopLoss,
-                generatedAt=str(tick_timestamp),
-                systemTimeStamp=str(datetime.now()),
+                generatedAt=tick_timestamp,
             )
-            self.internal_pending_orders_inventory.append(pendingOrderGenerated)
-            logger.debug(f"{tick_timestamp}: Added to internal pending order inventory with ID: {order_id}")
+            self.internal_pending_orders_inventory[order_id] = pendingOrderGenerated
+            self.level_index.add_pending(order_id, self.fib_level_ticks[fib_level])
+            if self.journal is not None:
+                self.journal.append("pending", order_id, to_row(pendingOrderGenerated))
+            hotlog.debug("pending", "{}: Added to internal pending order inventory with ID: {}", tick_timestamp, order_id)
+
+    def process_price(self, current_price: float, tick_timestamp: datetime):
+        """Process a tick priced in points (converted to integer ticks once, here)"""
+        self.process_tick(int(round(current_price * self.TICKS_PER_POINT)), tick_timestamp)
 
-    def process_price(self, current_price, tick_timestamp: datetime):
+    def process_tick(self, current_tick: int, tick_timestamp: datetime, low_tick: Optional[int] = None, high_tick: Optional[int] = None):
+        """Process a tick in integer ticks. A conflated update also passes the low/high of the ticks it merged."""
         # If threshold was reached, stop processing
         if self.threshold_reached:
             return
-            
-        # Update trading window status
+        started = now_ns()
+        if not self.order_events.empty():
+            self.handle_order_events()
+
+        # Update trading window status (cached until the next session open/close)
         was_in_trading_window = self.isTradingZoneActive
-        self.isTradingZoneActive = settings.isWithinAllowableTradingWindow(tick_timestamp)
+        self.isTradingZoneActive = self.trading_schedule.is_open(tick_timestamp)
+        if self.journal is not None and self.isTradingZoneActive != was_in_trading_window:
+            self.journal.append("window", self.isTradingZoneActive)
         
         # If we just left the trading window, cancel all orders
         if was_in_trading_window and not self.isTradingZoneActive:
-            logger.warning(f"{tick_timestamp}: Trading window ended, cancelling all orders")
+            hotlog.warning("window", "{}: Trading window ended, cancelling all orders", tick_timestamp)
             self.cancel_all_orders()
         
         # If we just entered the trading window, place orders for active levels
         if not was_in_trading_window and self.isTradingZoneActive and not self.threshold_reached:
-            logger.info(f"{tick_timestamp}: Trading window started, placing orders for active levels")
+            hotlog.info("window", "{}: Trading window started, placing orders for active levels", tick_timestamp)
+            # Only a restart can leave a level with an order at the window open
+            working = {order.fibRatioLevel for order in self.internal_pending_orders_inventory.values()}
             for fib_level, is_active in self.active_levels.items():
-                if is_active:
-                    fib_level_price = self.fib_levels[fib_level]
-                    pending_order_type = "SELL" if fib_level_price > current_price else "BUY"
-                    self.generate_pending_orders(pending_order_type, fib_level, fib_level_price, tick_timestamp)
+                if is_active and fib_level not in working:
+                    pending_order_type = "SELL" if self.fib_level_ticks[fib_level] > current_tick else "BUY"
+                    self.generate_pending_orders(pending_order_type, fib_level, self.fib_levels[fib_level], tick_timestamp)
         
-        if self.last_price is None:
-            self.last_price = current_price
+        if self.last_tick is None:
+            self.last_tick = current_tick
             return
 
+        conflated = low_tick is not None or high_tick is not None
+        low_tick = current_tick if low_tick is None else low_tick
+        high_tick = current_tick if high_tick is None else high_tick
+
+        if conflated:
+            # The merged range also holds prices from before any entry in this update: only
+            # positions that were already open, and reactivation, may use it
+            self.close_triggered(high_tick, low_tick, current_tick, tick_timestamp)
+            self.reactivate_levels(current_tick, tick_timestamp, low_tick, high_tick)
+
         # Check if any pending orders were hit
-        for pending_order in self.internal_pending_orders_inventory[:]:  # Use slice copy to avoid modification during iteration
-            if min(self.last_price, current_price) <= pending_order.price <= max(self.last_price, current_price):
-                position_type = "LONG" if pending_order.orderType == "BUY" else "SHORT"
-                self.enter_position(
-                    level=pending_order.fibRatioLevel,
-                    positionType=position_type,
-                    price=current_price,
-                    tick_timestamp=tick_timestamp,
-                    order_id=pending_order.orderId
-                )
-
-        # Analysis of open positions and marking as close if hit TP/SL
-        for position in self.open_positions[:]:
-            if (position.positionType == "LONG" and current_price >= position.takeProfit) or (
-                    position.positionType == "SHORT" and current_price <= position.takeProfit):
-                profit = +abs(position.takeProfit - position.positionEntryPrice)
-                self.close_position(position, "PROFIT", profit, current_price, tick_timestamp)
-            elif (position.positionType == "LONG" and current_price <= position.stopLoss) or (
-                    position.positionType == "SHORT" and current_price >= position.stopLoss):
-                loss = -abs(position.stopLoss - position.positionEntryPrice)
-                self.close_position(position, "LOSS", loss, current_price, tick_timestamp)
-
-        self.reactivate_levels(current_price, tick_timestamp)
-        self.last_price = current_price
+        crossed_order_ids = self.level_index.pending_in_range(
+            min(self.last_tick, low_tick), max(self.last_tick, high_tick)
+        )
+        for order_id in crossed_order_ids:
+            pending_order = self.internal_pending_orders_inventory[order_id]
+            position_type = "LONG" if pending_order.orderType == "BUY" else "SHORT"
+            self.enter_position(
+                level=pending_order.fibRatioLevel,
+                positionType=position_type,
+                tick=current_tick,
+                tick_timestamp=tick_timestamp,
+                order_id=order_id
+            )
+
+        if conflated:
+            # Positions entered in this update only know the last price
+            self.close_triggered(current_tick, current_tick, current_tick, tick_timestamp)
+        else:
+            self.close_triggered(high_tick, low_tick, current_tick, tick_timestamp)
+            self.reactivate_levels(current_tick, tick_timestamp, low_tick, high_tick)
+        self.last_tick = current_tick
+        if self.journal is not None and self.journal.snapshot_due:
+            self.journal.snapshot(self.journal_state())
+        if LATENCY.enabled:
+            self.tick_latency.record(now_ns() - started)
+
+    def close_triggered(self, high_tick: int, low_tick: int, current_tick: int, tick_timestamp):
+        """Close the open positions whose TP/SL lies in [low_tick, high_tick] (only crossed thresholds are popped)"""
+        for position_id, outcome in self.trigger_book.triggered(high_tick, low_tick):
+            if outcome == "PROFIT":
+                self.close_position(position_id, "PROFIT", self.to_points(self.TP_TICKS), current_tick, tick_timestamp)
+            else:
+                self.close_position(position_id, "LOSS", -self.to_points(self.SL_TICKS), current_tick, tick_timestamp)
+
+    @property
+    def total_pnl(self) -> float:
+        return self.stats.equity
 
     def get_total_pnl(self) -> float:
         """Get the current total profit and loss"""
-        return self.total_pnl
-
-    def print_pnl_summary(self):
-        """Print a summary of the current P&L status"""
-        cprint(f"\nCurrent Total P&L: {self.total_pnl:+.2f}", "black", "on_white")
-        print(f"Number of Closed Positions: {len(self.closed_positions)}")
-        if self.closed_positions:
-            winning_trades = sum(1 for pos in self.closed_positions if pos.outcome == "PROFIT")
-            losing_trades = sum(1 for pos in self.closed_positions if pos.outcome == "LOSS")
-            win_rate = (winning_trades / len(self.closed_positions)) * 100
-            print(f"Win Rate: {win_rate:.1f}% ({winning_trades}/{len(self.closed_positions)})")
-
-    def close_position(self, position, result, profit_loss, current_price, tick_timestamp):
-        self.open_positions.remove(position)
-        # Remove any associated orders from the map
-        self.order_to_position_map = {k: v for k, v in self.order_to_position_map.items() if v != position}
-        
-        closed_position = PositionClose(
+        return self.stats.equity
+
+    def close_position(self, position_id, result, profit_loss, current_tick: int, tick_timestamp):
+        position = self.open_positions.pop(position_id)
+        self.trigger_book.remove(position_id)
+        current_price = self.to_points(current_tick)
+
+        closed_position = ClosedPositionRecord(
             metadata=position,
             positionClosingPrice=current_price,
-            positionClosingTime= str(tick_timestamp),
-            systemTimeStamp = str(datetime.now()),
+            positionClosingTime=tick_timestamp,
             outcome=result,
             net=profit_loss
         )
         self.closed_positions.append(closed_position)
-        # Update total P&L
-        self.total_pnl += profit_loss
+        self.stats.record(profit_loss, position.positionType)
+        if self.journal is not None:
+            self.journal.append("close", position_id, result, profit_loss, current_price, tick_timestamp)
 
-        # Print position close and current P&L status
-        highlighted_message_color = "on_green" if closed_position.outcome == "PROFIT" else "on_red"
-        cprint(f"{tick_timestamp}: Position closed/flatten at {current_price} - {result}: {profit_loss}", "black", highlighted_message_color)
-        print(closed_position)
-        self.print_pnl_summary()  # Print updated P&L summary after each position close
+        self.reporter.position_closed(closed_position)
 
-        
         # Check profit/loss thresholds
-        if (self.profit_threshold is not None and self.total_pnl >= self.profit_threshold) or (self.loss_threshold is not None and self.total_pnl <= self.loss_threshold):
-            logger.warning(f"{'Profit' if self.total_pnl >= 0 else 'Loss'} threshold reached ({self.total_pnl}). Stopping trading.")
+        equity = self.stats.equity
+        if (self.profit_threshold is not None and equity >= self.profit_threshold) or (self.loss_threshold is not None and equity <= self.loss_threshold):
+            hotlog.warning("threshold", "{} threshold reached ({}). Stopping trading.", 'Profit' if equity >= 0 else 'Loss', equity)
             self.threshold_reached = True  # Set the flag
+            if self.journal is not None:
+                self.journal.append("threshold", date.today().isoformat())
             self.cancel_all_orders()
-            if not self.is_backtest:
+            if not self.is_backtest and self.exit_on_threshold:
                 sys.exit(0)
             return
         
-    def reactivate_levels(self, current_price, tick_timestamp):
-        for fib_level, fib_level_price in self.fib_levels.items():
-            if not self.active_levels[fib_level]:  # Only check inactive levels
-                if abs(current_price - fib_level_price) >= self.REACTIVATION_DISTANCE:
-                    self.active_levels[fib_level] = True
-                    logger.info(
-                        f"{tick_timestamp}: Reactivated Fib. ratio: {fib_level} ({fib_level_price}) at - current price: {current_price}")
-                    pending_order_type = "SELL" if fib_level_price > current_price else "BUY"
-                    self.generate_pending_orders(pending_order_type, fib_level, fib_level_price, tick_timestamp)
+    def reactivate_levels(self, current_tick: int, tick_timestamp, low_tick: Optional[int] = None, high_tick: Optional[int] = None):
+        # Only inactive levels outside the reactivation band are returned
+        low_tick = current_tick if low_tick is None else low_tick
+        high_tick = current_tick if high_tick is None else high_tick
+        for fib_level in self.level_index.levels_to_reactivate(low_tick, high_tick, self.REACTIVATION_TICKS):
+            fib_level_price = self.fib_levels[fib_level]
+            self.active_levels[fib_level] = True
+            if self.journal is not None:
+                self.journal.append("level", fib_level, True)
+            hotlog.info("reactivation", "{}: Reactivated Fib. ratio: {} ({}) at - current price: {}",
+                        tick_timestamp, fib_level, fib_level_price, self.to_points(current_tick))
+            pending_order_type = "SELL" if self.fib_level_ticks[fib_level] > current_tick else "BUY"
+            self.generate_pending_orders(pending_order_type, fib_level, fib_level_price, tick_timestamp)
+
+    def journal_state(self) -> Dict:
+        """Compact snapshot of everything the journal entries change"""
+        return {
+            "day": date.today().isoformat(),
+            "window": self.isTradingZoneActive,
+            "threshold_reached": self.threshold_reached,
+            "active_levels": [[level, active] for level, active in self.active_levels.items()],
+            "pending": [[order_id, to_row(order)] for order_id, order in self.internal_pending_orders_inventory.items()],
+            "open": [[position_id, to_row(position)] for position_id, position in self.open_positions.items()],
+            "nt_orders": [
+                [handle.reference, handle.order.id, handle.order.oco_id, handle.order.strategy, handle.instrument,
+                 handle.account, handle.action, handle.quantity, handle.price]
+                for handle in self.orders_placed_ninjatrader if handle.status == PLACED
+            ],
+            "stats": self.stats.to_state(),
+        }
+
+    def open_journal(self, journal_dir: str):
+        """Replay the journal left by a previous run (if any) and start journaling"""
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{self.INSTRUMENT}_{self.POINT_A}_{self.POINT_B}_{self.NT_ACCOUNT}")
+        self.journal = Journal(journal_dir, name)
+        started = time.perf_counter()
+        snapshot, entries = self.journal.load()
+        if snapshot is not None or entries:
+            self.restore(snapshot, entries)
+            logger.warning(f"Recovered state from {self.journal.journal_path} in {(time.perf_counter() - started) * 1000:.1f}ms: "
+                           f"{len(entries)} entries replayed, {sum(self.active_levels.values())} active levels, "
+                           f"{len(self.internal_pending_orders_inventory)} pending orders, {len(self.open_positions)} open positions, "
+                           f"P&L {self.stats.equity:+.2f}")
+        self.journal.open()
+        self.journal.append("day", date.today().isoformat())
+
+    def restore(self, snapshot: Optional[Dict], entries: List[list]):
+        """Rebuild the strategy state from a snapshot plus the journal entries written after it"""
+        recovered_orders: Dict[str, list] = {}
+        # The profit/loss threshold is daily: P&L and the threshold stop only carry over within the same day
+        day = None
+        if snapshot is not None:
+            day = snapshot.get("day")
+            self.isTradingZoneActive = snapshot["window"]
+            self.threshold_reached = snapshot["threshold_reached"]
+            for level, active in snapshot["active_levels"]:
+                self.active_levels[level] = active
+            for order_id, row in snapshot["pending"]:
+                self.internal_pending_orders_inventory[order_id] = from_row(PendingOrderRecord, row)
+            for position_id, row in snapshot["open"]:
+                self.open_positions[position_id] = from_row(OpenPositionRecord, row)
+            for row in snapshot["nt_orders"]:
+                recovered_orders[row[0]] = row
+            self.stats.load_state(snapshot["stats"])
+
+        for _, kind, *fields in entries:
+            if kind == "window":
+                self.isTradingZoneActive = fields[0]
+            elif kind == "level":
+                self.active_levels[fields[0]] = fields[1]
+            elif kind == "pending":
+                self.internal_pending_orders_inventory[fields[0]] = from_row(PendingOrderRecord, fields[1])
+            elif kind == "open":
+                self.open_positions[fields[0]] = from_row(OpenPositionRecord, fields[1])
+                self.internal_pending_orders_inventory.pop(fields[0], None)
+            elif kind == "close":
+                position_id, result, profit_loss, closing_price, closing_time = fields
+                position = self.open_positions.pop(position_id, None)
+                if position is not None:
+                    self.closed_positions.append(ClosedPositionRecord(
+                        metadata=position,
+                        positionClosingPrice=closing_price,
+                        positionClosingTime=datetime.fromisoformat(closing_time),
+                        outcome=result,
+                        net=profit_loss
+                    ))
+                    self.stats.record(profit_loss, position.positionType)
+            elif kind == "rejected":
+                self.internal_pending_orders_inventory.pop(fields[0], None)
+            elif kind == "flat":
+                self.open_positions.pop(fields[0], None)
+            elif kind == "cancel_all":
+                self.internal_pending_orders_inventory.clear()
+                recovered_orders.clear()
+            elif kind == "threshold":
+                self.threshold_reached = True
+            elif kind == "day":
+                day = fields[0]
+            elif kind == "nt_order":
+                recovered_orders[fields[0][0]] = fields[0]
+
+        if day != date.today().isoformat():
+            self.threshold_reached = False
+            self.stats.load_state(TradeStats().to_state())
+
+        # Derived indexes
+        self.level_index = LevelIndex(self.fib_level_ticks)
+        for level, active in self.active_levels.items():
+            if active:
+                self.level_index.activate(level)
+        for order_id, order in self.internal_pending_orders_inventory.items():
+            self.level_index.add_pending(order_id, self.fib_level_ticks[order.fibRatioLevel])
+        self.trigger_book = TriggerBook()
+        for position_id, position in self.open_positions.items():
+            self.trigger_book.add(position_id, position.positionType,
+                                  to_ticks(position.takeProfit, self.TICKS_PER_POINT), to_ticks(position.stopLoss, self.TICKS_PER_POINT))
+        self.recovered_orders = recovered_orders
+
+    def reconcile_orders(self):
+        """After a restart, match the recovered state to what NinjaTrader reports.
+
+        Working orders are re-attached and orders filled while the bot was down are entered. Pending orders
+        NinjaTrader doesn't know (or cancelled/rejected) are dropped; their levels stay active, so the first
+        tick places them again if the trading window is open then. Restored positions that are already
+        flat are dropped.
+        """
+        recovered, self.recovered_orders = self.recovered_orders, None
+        attached = filled = dropped = 0
+        template_key = f"{self.TP}_{self.SL}"
+        # Order states stream in after the handshake: wait for all of them together, briefly
+        statuses = {order_id: self.ntclient.watch(f"OrderStatus|{row[1]}") for order_id, row in recovered.items()}
+        concurrent.futures.wait(statuses.values(), timeout=2.0)
+        for order_id, future in statuses.items():
+            if not future.done():
+                self.ntclient.unwatch(f"OrderStatus|{recovered[order_id][1]}", future)
+        status_of = {order_id: future.result() for order_id, future in statuses.items() if future.done()}
+
+        for order_id, pending_order in list(self.internal_pending_orders_inventory.items()):
+            row = recovered.get(order_id)
+            status = status_of.get(order_id, "")
+            if row is not None and status and status not in FINAL_ORDER_STATUSES:
+                _, nt_order_id, oco_id, strategy, instrument, account, action, quantity, price = row
+                order = Order(instrument_name=instrument, action=action, strategy=strategy, quantity=quantity, price=price)
+                order.id, order.oco_id = nt_order_id, oco_id
+                self.orders_placed_ninjatrader.append(
+                    self.gateway.attach(order, account, template_key, events=self.order_events, reference=order_id))
+                attached += 1
+            elif row is not None and status == "Filled":
+                # Filled while the bot was down: take the entry at the level price, as a crossing would have.
+                # NinjaTrader holds the position whatever the trading window says now.
+                position_type = "LONG" if pending_order.orderType == "BUY" else "SHORT"
+                in_window, self.isTradingZoneActive = self.isTradingZoneActive, True
+                self.enter_position(pending_order.fibRatioLevel, position_type,
+                                    self.fib_level_ticks[pending_order.fibRatioLevel], datetime.now(), order_id)
+                self.isTradingZoneActive = in_window
+                filled += 1
+            else:
+                # Never acknowledged, unknown to NinjaTrader, or cancelled/rejected: nothing is working for this level
+                self.internal_pending_orders_inventory.pop(order_id)
+                self.level_index.remove_pending(order_id, self.fib_level_ticks[pending_order.fibRatioLevel])
+                if self.journal is not None:
+                    self.journal.append("rejected", order_id)
+                dropped += 1
+
+        flat = self.reconcile_positions(recovered, status_of)
+
+        # The window may have opened or closed while the bot was down: let the first tick decide with
+        # the current schedule (opening places orders for the active levels that have none)
+        if self.isTradingZoneActive:
+            self.isTradingZoneActive = False
+            if self.journal is not None:
+                self.journal.append("window", False)
+        if attached and not self.trading_schedule.is_open(datetime.now()):
+            self.cancel_all_orders()
+        logger.success(f"Reconciled with NinjaTrader: {attached} orders still working, {filled} filled while down, "
+                       f"{dropped} missing orders left for the next window check, {flat} positions already flat")
+
+    def reconcile_positions(self, recovered: Dict[str, list], status_of: Dict[str, str]) -> int:
+        """Drop restored positions NinjaTrader no longer holds (entry never filled, or closed by the ATM brackets
+        while the bot was down). Assumes the bot is the only one trading its instrument on the account."""
+        if not self.open_positions:
+            return 0
+        closed = [position_id for position_id in self.open_positions
+                  if status_of.get(position_id) in ("Cancelled", "Rejected", "Expired")]
+        key = f"MarketPosition|{self.INSTRUMENT}|{self.NT_ACCOUNT}"
+        value = self.ntclient.wait_for(key, lambda value: value != "", timeout=2.0)
+        if value is None:
+            logger.warning(f"No market position from NinjaTrader: keeping {len(self.open_positions)} restored positions")
+        else:
+            net = 0 if is_flat(value) else int(float(value))
+            still_open = [position_id for position_id in self.open_positions if position_id not in closed]
+            # Positions on the other side of the account's position (all of them when it is flat) are closed
+            for position_id in still_open:
+                side = 1 if self.open_positions[position_id].positionType == "LONG" else -1
+                if side * net <= 0:
+                    closed.append(position_id)
+            held = [position_id for position_id in still_open if position_id not in closed]
+            # A smaller position than ours: the oldest positions were closed first
+            extra = len(held) - abs(net) // max(self.QUANTITY, 1)
+            closed += held[:max(extra, 0)]
+        for position_id in closed:
+            position = self.open_positions.pop(position_id)
+            self.trigger_book.remove(position_id)
+            if self.journal is not None:
+                self.journal.append("flat", position_id)
+            logger.warning(f"{position.positionType} position at {position.positionEntryPrice} (ratio {position.fibRatioLevel}) "
+                           f"is no longer open on NinjaTrader: dropped, its P&L is not in the statistics")
+        return len(closed)
+
+    def cancel_on_shutdown(self) -> bool:
+        """Cancel every order before stopping; False when the cancels could not even be queued"""
+        try:
+            self.cancel_all_orders()
+            return True
+        except Exception as e:
+            logger.error(f"Cancelling orders failed: {e}")
+            return False
+
+    def close_journal(self, clean: bool = False):
+        """Write a final snapshot and close the journal (after the gateway has sent the shutdown cancels).
+
+        Only an intentional stop with every cancel confirmed and no open position starts the next run
+        from fresh levels; the day's P&L and threshold are kept either way. Anything else (an error, a
+        lost connection, a cancel that failed, ATM brackets still live) keeps the full state for recovery.
+        """
+        if self.journal is None:
+            return
+        confirmed = clean
+        for handle, pending_order in self.cancelling:
+            if handle.status == PLACED:
+                # The cancel did not go through: the order is still live on NinjaTrader
+                confirmed = False
+                self.orders_placed_ninjatrader.append(handle)
+                if pending_order is not None:
+                    self.internal_pending_orders_inventory[handle.reference] = pending_order
+        self.cancelling = []
+        state = self.journal_state()
+        if confirmed and not self.open_positions:
+            state.update(window=False, active_levels=[], pending=[], open=[], nt_orders=[])
+        else:
+            logger.warning(f"Keeping the state journal for recovery: {len(self.open_positions)} open positions, "
+                           f"{len(state['nt_orders'])} live orders")
+        self.journal.snapshot(state)
+        self.journal.close()
+
+    def connect_ninjatrader(self):
+        if self.ntclient.set_up(True) != 0:
+            raise ConnectionError("cannot connect to the NinjaTrader ATI")
+        if not self.ntclient.get_string("ATI"):
+            raise ConnectionError("no ATI handshake from NinjaTrader")
+
+    def connect_redis(self):
+        self.client = get_redis_client(decode_responses=False)
+        if self.client is None:
+            raise ConnectionError("cannot connect to Redis")
+
+    def warm_up(self, redis: bool = True, timeout: float = 30.0):
+        """Connect and prepare everything the live loop needs, concurrently, and report the startup time.
+
+        Levels and the level index are already built by the constructor; backtests have nothing else to wait for.
+        """
+        tasks = {}
+        if not self.is_backtest:
+            tasks["ninjatrader"] = self.connect_ninjatrader
+            tasks["atm template"] = lambda: self.gateway.template(f"{self.TP}_{self.SL}", self.INSTRUMENT)
+            if redis:
+                tasks["redis"] = self.connect_redis
+        durations = warm_up(tasks, timeout=timeout)
+        if self.recovered_orders is not None:
+            self.reconcile_orders()
+        details = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in durations.items())
+        logger.success(f"Ready in {time.perf_counter() - self.created_at:.2f}s" + (f" ({details})" if details else ""))
+        return durations
 
     def production(self):
-        self.client = get_redis_client()
+        if self.client is None:
+            self.connect_redis()
         pubsub = self.client.pubsub()
         pubsub.subscribe(self.PRICE_STREAM_CHANNEL)
         running = True
         logger.debug("Listening for price stream...")
+        self.start_latency_reports()
+        self.reporter.start()
+        interrupted = False
         try:
             while running:
                 message = pubsub.get_message(timeout=1)
                 if message:
                     if message["type"] == "message":
-                        _data = json.loads(message['data'])
-                        timestamp_dt: datetime = datetime.strptime(_data["TIMESTAMP"], "%Y-%m-%d %H:%M:%S.%f")
-                        self.process_price(
-                            current_price=float(_data["LAST"]),
-                            tick_timestamp=timestamp_dt
-                        )
+                        LATENCY.tick_received_ns = received = now_ns()
+                        current_tick, timestamp_dt = self.decode_price_message(message['data'])
+                        LATENCY.record("decode", received)
+                        self.process_tick(current_tick, tick_timestamp=timestamp_dt)
+        except KeyboardInterrupt:
+            interrupted = True
+            logger.warning("Interrupted, stopping the price stream")
         except Exception as e:
             logger.error(f"Error occurred: {e}")
         finally:
             logger.error("Error in main price streaming loop. Cancelling all orders")
-            self.cancel_all_orders()
+            cancelled = self.cancel_on_shutdown()
             pubsub.close()
             self.client.close()
+            self.stop_gateway()
+            # The threshold stop leaves through sys.exit()
+            self.close_journal(clean=cancelled and (interrupted or self.threshold_reached))
             self.ntclient.Dispose()
+            self.stop_latency_reports()
+            self.reporter.stop()
+            hotlog.stop()
             logger.success("Subscriber closed.")
 
-    def backtest(self, path):
-        price_stream = stream_file(file_path=path)
-        for row in price_stream:
-            parts = row.split(';')
-            if len(parts) < 2:
-                continue
+    def decode_price_message(self, data) -> Tuple[int, datetime]:
+        """Decode a binary frame or a legacy JSON price message into (price in ticks, tick timestamp)"""
+        if is_binary(data):
+            frame = decode_tick(data)
+            if self.last_sequence is not None and frame.sequence > self.last_sequence + 1:
+                self.sequence_gaps += frame.sequence - self.last_sequence - 1
+                hotlog.warning("stream", "{}: Price stream gap, {} ticks missing before #{}",
+                               frame.timestamp, frame.sequence - self.last_sequence - 1, frame.sequence)
+            self.last_sequence = frame.sequence
+            if frame.ticks_per_point == self.TICKS_PER_POINT:
+                return frame.tick, frame.timestamp
+            return int(round(frame.price * self.TICKS_PER_POINT)), frame.timestamp
+        current_price, timestamp_dt = decode_json(data)
+        return int(round(current_price * self.TICKS_PER_POINT)), timestamp_dt
+
+    def process_messages(self, batch: List[QueuedMessage]):
+        """Process queued price stream messages in arrival order (asyncio ingestion handler)"""
+        if self.conflation_depth and len(batch) > self.conflation_depth:
+            self.process_conflated(batch)
+            return
+        for _, data, received in batch:
+            if self.threshold_reached:
+                return
+            LATENCY.tick_received_ns = received
+            started = now_ns()
+            LATENCY.record("queue", received, started)
             try:
-                _timestamp = parts[0]
-                formatted_date_str = _timestamp[:-1]
-                dt = datetime.strptime(formatted_date_str, "%Y%m%d %H%M%S %f")
-                current_price = float(parts[1])
-                self.process_price(current_price, tick_timestamp=dt)
-            except ValueError:
+                current_tick, timestamp_dt = self.decode_price_message(data)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Skipping malformed price message: {e}")
                 continue
+            LATENCY.record("decode", started)
+            self.process_tick(current_tick, tick_timestamp=timestamp_dt)
+
+    def process_conflated(self, batch: List[QueuedMessage]):
+        """Merge a backlog into min/max/last updates so every crossing and TP/SL touch in it is still seen"""
+        ticks = []
+        for _, data, _ in batch:
+            try:
+                ticks.append(self.decode_price_message(data))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Skipping malformed price message: {e}")
+
+        # Ticks on both sides of a trading window open/close are kept in separate updates
+        updates = conflate(ticks, key=self.trading_schedule.is_open)
+        hotlog.debug("stream", "Conflated {} queued ticks into {} updates", len(ticks), len(updates))
+        start = 0
+        for update in updates:
+            merged, start = ticks[start:start + update.count], start + update.count
+            if self.conflation_is_exact(update.low, update.high, update.timestamp):
+                self.conflated_ticks += update.count - 1
+                self.process_tick(update.last, update.timestamp, update.low, update.high)
+            else:
+                # Something happens in this stretch: replay it tick by tick so results match unconflated processing
+                for current_tick, timestamp_dt in merged:
+                    self.process_tick(current_tick, tick_timestamp=timestamp_dt)
+
+    def conflation_is_exact(self, low_tick: int, high_tick: int, timestamp) -> bool:
+        """True when a merged update can't enter, close or reactivate anything (nor open/close the window)"""
+        if self.last_tick is None or self.threshold_reached or self.trading_schedule.is_open(timestamp) != self.isTradingZoneActive:
+            return False
+        if self.level_index.pending_in_range(min(self.last_tick, low_tick), max(self.last_tick, high_tick)):
+            return False
+        lowest_inactive, highest_inactive = self.level_index.inactive_bounds()
+        if lowest_inactive <= high_tick - self.REACTIVATION_TICKS or highest_inactive >= low_tick + self.REACTIVATION_TICKS:
+            return False
+        upper_trigger, lower_trigger = self.trigger_book.bounds()
+        return lower_trigger < low_tick and high_tick < upper_trigger
+
+    def production_async(self, queue_size: int = 10_000, conflation_depth: int = 0):
+        """Production loop on redis.asyncio: reads never wait on tick processing or order placement"""
+        self.conflation_depth = conflation_depth
+        ingestor = PriceIngestor(
+            connect=get_async_redis_client,
+            channels=[self.PRICE_STREAM_CHANNEL],
+            handler=self.process_messages,
+            maxsize=queue_size,
+            should_stop=lambda: self.threshold_reached,
+        )
+        self.ingestor = ingestor
+        self.start_latency_reports()
+        self.reporter.start()
+        stopped = False
+        try:
+            asyncio.run(ingestor.run())
+            stopped = True  # threshold reached
+        except KeyboardInterrupt:
+            stopped = True
+            logger.warning("Interrupted, stopping price ingestion")
+        finally:
+            logger.error(f"Price ingestion stopped ({self.conflated_ticks} ticks conflated). Cancelling all orders")
+            cancelled = self.cancel_on_shutdown()
+            self.stop_gateway()
+            self.close_journal(clean=cancelled and stopped)
+            self.ntclient.Dispose()
+            self.stop_latency_reports()
+            self.reporter.stop()
+            hotlog.stop()
+            logger.success("Subscriber closed.")
+
+    def production_nt8(self):
+        """Production loop on NinjaTrader's own market data: last trades come straight off the ATI socket, no Redis hop"""
+        feed = self.ntclient.tick_feed(self.INSTRUMENT)
+        logger.debug(f"Listening for {self.INSTRUMENT} ticks from NinjaTrader...")
+        self.start_latency_reports()
+        self.reporter.start()
+        interrupted = False
+        try:
+            while True:
+                tick = feed.get(timeout=1)
+                if tick is None:
+                    if self.ntclient.socket is None or not self.ntclient.socket.is_connected:
+                        raise ConnectionError("NinjaTrader ATI connection lost")
+                    continue
+                LATENCY.tick_received_ns = now_ns()
+                # DATA messages carry the time to the second, or a 1800-01-01 placeholder
+                timestamp_dt = tick.time if tick.time.year > 1800 else datetime.now()
+                self.process_tick(int(round(tick.price * self.TICKS_PER_POINT)), tick_timestamp=timestamp_dt)
+        except KeyboardInterrupt:
+            interrupted = True
+            logger.warning("Interrupted, stopping the NinjaTrader feed")
+        except Exception as e:
+            logger.error(f"Error occurred: {e}")
+        finally:
+            logger.error("NinjaTrader feed stopped. Cancelling all orders")
+            feed.close()
+            cancelled = self.cancel_on_shutdown()
+            self.stop_gateway()
+            self.close_journal(clean=cancelled and (interrupted or self.threshold_reached))
+            self.ntclient.Dispose()
+            self.stop_latency_reports()
+            self.reporter.stop()
+            hotlog.stop()
+            logger.success("Subscriber closed.")
+
+    def stop_gateway(self):
+        """Send the queued order commands (e.g. the shutdown cancels) and log their acknowledgements"""
+        self.gateway.stop()
+        self.handle_order_events()
+
+    def start_latency_reports(self):
+        if LATENCY.enabled:
+            LATENCY.start_periodic_report(LATENCY_REPORT_INTERVAL, lambda report: logger.info(f"Tick-to-order latency\n{report}"))
+
+    def stop_latency_reports(self):
+        LATENCY.stop_periodic_report()
+        if LATENCY.rows():
+            logger.info(f"Tick-to-order latency\n{LATENCY.report()}")
+
+    def backtest(self, path, engine: str = "scalar"):
+        if engine == "vectorized":
+            if not is_valid_file_path(path):
+                raise FileNotFoundError(f"Error: Cannot read file at {path}")
+            VectorizedBacktest.from_file(self, path).run()
+        else:
+            price_stream = stream_file(file_path=path)
+            for row in price_stream:
+                parts = row.split(';')
+                if len(parts) < 2:
+                    continue
+                try:
+                    dt = parse_export_timestamp(parts[0])
+                    current_price = float(parts[1])
+                    self.process_price(current_price, tick_timestamp=dt)
+                except ValueError:
+                    continue
+        # Write out the buffered tick path logs and position closes before the statement
+        hotlog.stop()
+        self.reporter.stop()
         logger.success("Generating P&L statement for overall backtesting")
-        print_position_close_table(self.closed_positions)
-        print_position_summary_table(self.closed_positions)
+        if not self.quiet:
+            print_position_close_table(self.closed_positions)
+        print_position_summary_table(self.stats)
+        if LATENCY.rows():
+            print("\nEngine latency per stage")
+            print(LATENCY.report())
 
 @app.command()
 def production(
@@ -430,15 +998,29 @@ def production(
     price_stream_channel: str = typer.Option("NT8_ES_PRICESTREAM", help="Redis channel for price stream"),
     fibonacci_ratios: str = typer.Option("[0,0.23,0.38,0.50,0.618,0.78,1.0,1.23,1.618,2.14,2.618,3.618,-0.23,-0.618,-1.14,-1.618,-2.14,-2.618,-3.618]", help="JSON array of Fibonacci ratios"),
     logging_level: str = typer.Option("INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR)"),
+    ingestion: str = typer.Option("sync", help="Price stream ingestion: 'sync' (polling loop) or 'async' (asyncio reader + bounded queue)"),
+    queue_size: int = typer.Option(10000, help="Bounded queue size for async ingestion (oldest ticks are dropped when full)"),
+    conflation_depth: int = typer.Option(0, help="Async ingestion: merge backlogs deeper than this into min/max/last updates (0 disables)"),
+    log_dir: str = typer.Option("logs", help="Directory for rotating log files (empty to log to stderr only)"),
+    log_sample: str = typer.Option("", help="Keep every n-th tick path log per category, e.g. 'reactivation=10,pending=5'"),
+    startup_timeout: float = typer.Option(30.0, help="Seconds to wait for NinjaTrader, Redis and the ATM template before giving up"),
+    journal_dir: str = typer.Option("journal", help="Directory for the crash-recovery state journal (empty to disable)"),
+    price_source: str = typer.Option("redis", help="Where ticks come from: 'redis' (price stream channel) or 'nt8' (NinjaTrader market data on the ATI socket)"),
 ):
     """Run the Fibonacci trading bot in production mode"""
+    if price_source not in ("redis", "nt8"):
+        typer.echo("Error: price_source must be 'redis' or 'nt8'")
+        sys.exit(1)
+
     # Parse fibonacci ratios from JSON string
     try:
         fib_ratios = json.loads(fibonacci_ratios)
     except json.JSONDecodeError:
         typer.echo("Error: fibonacci_ratios must be a valid JSON array")
         sys.exit(1)
-        
+
+    # Tick path messages are buffered and written by a background thread (to rotating files in log_dir)
+    configure_logging(logging_level, log_dir=log_dir, sampling=parse_sampling(log_sample))
     bot = FibonacciTradingBot(
         point_a=point_a,
         point_b=point_b,
@@ -450,19 +1032,55 @@ def production(
         nt_account=nt_account,
         price_stream_channel=price_stream_channel,
         fibonacci_ratios=fib_ratios,
-        logging_level=logging_level,
         is_backtest=False,
         profit_threshold=profit_threshold,
-        loss_threshold=loss_threshold if loss_threshold is None else -abs(loss_threshold)
+        loss_threshold=loss_threshold if loss_threshold is None else -abs(loss_threshold),
+        journal_dir=journal_dir
     )
-    
-    # Add startup timer
-    print("\nStarting bot in 10 seconds...")
-    for _ in tqdm(range(10), desc="Startup", unit="s"):
-        time.sleep(1)
+
+    # Go live as soon as NinjaTrader, Redis and the ATM template are ready
+    try:
+        bot.warm_up(redis=price_source == "redis" and ingestion == "sync", timeout=startup_timeout)
+    except StartupError as e:
+        logger.error(f"Startup failed: {e}")
+        # A failed connect leaves a (non-daemon) reconnect timer running
+        bot.ntclient.Dispose()
+        sys.exit(1)
     print("\nBot is now running...")
-    
-    bot.production()
+
+    if price_source == "nt8":
+        bot.production_nt8()
+    elif ingestion == "async":
+        bot.production_async(queue_size=queue_size, conflation_depth=conflation_depth)
+    else:
+        bot.production()
+
+@app.command()
+def host(
+    config_file: str = typer.Option(..., help="JSON file listing the bots to run in this process"),
+    startup_timeout: float = typer.Option(30.0, help="Seconds to wait for NinjaTrader, Redis and the ATM templates before giving up"),
+):
+    """Run several bots (instruments/anchors) in one process with shared connections"""
+    # Imported here: the host module builds on FibonacciTradingBot
+    from tickr.strategies.fibonacci.host import StrategyHost, load_host_config
+
+    try:
+        config = load_host_config(config_file)
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: invalid host config {config_file}: {e}")
+        sys.exit(1)
+
+    # One logging setup for every hosted bot
+    configure_logging(config.logging_level, log_dir=config.log_dir, sampling=config.log_sampling)
+    strategy_host = StrategyHost(config)
+    try:
+        strategy_host.warm_up(timeout=startup_timeout)
+    except StartupError as e:
+        logger.error(f"Startup failed: {e}")
+        strategy_host.ntclient.Dispose()
+        sys.exit(1)
+    print(f"\nHosting {len(strategy_host.bots)} bots in one process")
+    strategy_host.run()
 
 @app.command()
 def backtest(
@@ -481,6 +1099,10 @@ def backtest(
     price_stream_channel: str = typer.Option("NT8_ES_PRICESTREAM", help="Redis channel for price stream"),
     fibonacci_ratios: str = typer.Option("[0,0.23,0.38,0.50,0.618,0.78,1.0,1.23,1.618,2.14,2.618,3.618,-0.23,-0.618,-1.14,-1.618,-2.14,-2.618,-3.618]", help="JSON array of Fibonacci ratios"),
     logging_level: str = typer.Option("INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR)"),
+    engine: str = typer.Option("scalar", help="Backtest engine: 'scalar' (tick by tick) or 'vectorized' (numpy, event driven)"),
+    log_dir: str = typer.Option(None, help="Directory for rotating log files (stderr only by default)"),
+    log_sample: str = typer.Option("", help="Keep every n-th tick path log per category, e.g. 'reactivation=10,pending=5'"),
+    quiet: bool = typer.Option(False, help="Only print the P&L summary (no configuration, position closes or trade table)"),
 ):
     """Run the Fibonacci trading bot in backtest mode"""
     if not filepath:
@@ -495,7 +1117,8 @@ def backtest(
         sys.exit(1)
         
     typer.echo(f"\nRunning backtesting on dataset: {filepath}")
-    
+
+    configure_logging(logging_level, log_dir=log_dir, sampling=parse_sampling(log_sample))
     bot = FibonacciTradingBot(
         point_a=point_a,
         point_b=point_b,
@@ -507,17 +1130,81 @@ def backtest(
         nt_account=nt_account,
         price_stream_channel=price_stream_channel,
         fibonacci_ratios=fib_ratios,
-        logging_level=logging_level,
         is_backtest=True,
         profit_threshold=profit_threshold,
-        loss_threshold=loss_threshold if loss_threshold is None else -abs(loss_threshold)
+        loss_threshold=loss_threshold if loss_threshold is None else -abs(loss_threshold),
+        quiet=quiet
     )
-    # Add startup timer
-    print("\nStarting bot in 10 seconds...")
-    for _ in tqdm(range(10), desc="Startup", unit="s"):
-        time.sleep(1)
+    bot.warm_up()
     print(f"Backtesting on {filepath}")
-    bot.backtest(filepath)
+    bot.backtest(filepath, engine=engine)
+
+@app.command()
+def cache(
+    filepath: str = typer.Option(..., help="Path to the .Last.txt export to convert"),
+    instrument: str = typer.Option(..., help="Trading instrument (e.g., 'NQ SEP24'), used for the tick size"),
+):
+    """Convert a tick export into the binary memory-mapped tick cache"""
+    if not is_valid_file_path(filepath):
+        typer.echo(f"Error: Cannot read file at {filepath}")
+        sys.exit(1)
+    started = time.perf_counter()
+    meta = build_tick_cache(filepath, TICK_TO_POINT[instrument.split(" ")[0]])
+    typer.echo(f"Cached {meta['rows']} ticks in {cache_dir_for(filepath)} ({time.perf_counter() - started:.2f}s)")
+
+@app.command()
+def sweep(
+    filepath: str = typer.Option(..., help="Path to the backtest data file"),
+    point_a: str = typer.Option(..., help="Point A values: 'start:stop:step', 'a,b,c' or a single value"),
+    point_b: str = typer.Option(..., help="Point B values: 'start:stop:step', 'a,b,c' or a single value"),
+    instrument: str = typer.Option(..., help="Trading instrument (e.g., 'NQ SEP24')"),
+    quantity: int = typer.Option(2, help="Number of contracts to trade"),
+    take_profit: str = typer.Option("15", help="Take profit values in points, on the tick grid (range or list)"),
+    stop_loss: str = typer.Option("20", help="Stop loss values in points, on the tick grid (range or list)"),
+    reactivation_distance: str = typer.Option(..., help="Reactivation distance values (range or list)"),
+    profit_threshold: float = typer.Option(None, help="Stop trading if total profit exceeds this value"),
+    loss_threshold: float = typer.Option(None, help="Stop trading if total loss exceeds this value (provide as positive number)"),
+    fibonacci_ratio_sets: str = typer.Option("[[0,0.23,0.38,0.50,0.618,0.78,1.0,1.23,1.618,2.14,2.618,3.618,-0.23,-0.618,-1.14,-1.618,-2.14,-2.618,-3.618]]", help="JSON array of Fibonacci ratio arrays"),
+    workers: int = typer.Option(None, help="Number of worker processes (defaults to CPU count)"),
+    top: int = typer.Option(20, help="Number of ranked results to print (0 for all)"),
+):
+    """Backtest a grid of parameters in parallel and print a ranked result table"""
+    try:
+        ratio_sets = json.loads(fibonacci_ratio_sets)
+        ticks_per_point = TICK_TO_POINT[instrument.split(" ")[0]]
+        grid = {
+            "point_a": parse_range(point_a),
+            "point_b": parse_range(point_b),
+            "take_profit": parse_tick_range(take_profit, ticks_per_point),
+            "stop_loss": parse_tick_range(stop_loss, ticks_per_point),
+            "reactivation_distance": parse_range(reactivation_distance),
+            "fibonacci_ratios": ratio_sets,
+        }
+    except KeyError:
+        typer.echo(f"Error: unknown instrument {instrument}")
+        sys.exit(1)
+    except (json.JSONDecodeError, ValueError) as e:
+        typer.echo(f"Error: invalid sweep parameters: {e}")
+        sys.exit(1)
+    if not is_valid_file_path(filepath):
+        typer.echo(f"Error: Cannot read file at {filepath}")
+        sys.exit(1)
+
+    fixed = {
+        "instrument": instrument,
+        "quantity": quantity,
+        "profit_threshold": profit_threshold,
+        "loss_threshold": loss_threshold if loss_threshold is None else -abs(loss_threshold),
+    }
+    combinations = 1
+    for values in grid.values():
+        combinations *= len(values)
+    typer.echo(f"\nSweeping {combinations} combinations on dataset: {filepath}")
+
+    started = time.perf_counter()
+    results = run_sweep(filepath, grid, fixed, workers=workers)
+    print_sweep_table(results, top=top or None)
+    typer.echo(f"Sweep finished in {time.perf_counter() - started:.2f}s")
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -0,0 +1,130 @@
+from typing import Dict, List
+
+
+class SideStats:
+    """Running counts and totals for one side (LONG/SHORT) or for all trades."""
+
+    __slots__ = ("trades", "wins", "losses", "gross_profit", "gross_loss")
+
+    def __init__(self):
+        self.trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0  # negative sum of losing trades
+
+    def record(self, net: float) -> None:
+        self.trades += 1
+        if net > 0:
+            self.wins += 1
+            self.gross_profit += net
+        elif net < 0:
+            self.losses += 1
+            self.gross_loss += net
+
+    @property
+    def net(self) -> float:
+        return self.gross_profit + self.gross_loss
+
+    def to_state(self) -> Dict:
+        return {name: getattr(self, name) for name in SideStats.__slots__}
+
+    def load_state(self, state: Dict) -> None:
+        for name in SideStats.__slots__:
+            setattr(self, name, state[name])
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades * 100 if self.trades else 0.0
+
+    @property
+    def avg_win(self) -> float:
+        return self.gross_profit / self.wins if self.wins else 0.0
+
+    @property
+    def avg_loss(self) -> float:
+        return self.gross_loss / self.losses if self.losses else 0.0
+
+    @property
+    def expectancy(self) -> float:
+        """Average net result per trade."""
+        return self.net / self.trades if self.trades else 0.0
+
+
+class TradeStats(SideStats):
+    """P&L statistics updated in O(1) per closed position.
+
+    On top of the overall counts it tracks running equity, its peak and the max
+    drawdown from that peak, the current and longest losing streaks, and a
+    `SideStats` per position type.
+    """
+
+    __slots__ = ("equity", "peak_equity", "max_drawdown", "losing_streak", "longest_losing_streak", "sides")
+
+    def __init__(self):
+        super().__init__()
+        self.equity = 0.0
+        self.peak_equity = 0.0
+        self.max_drawdown = 0.0
+        self.losing_streak = 0
+        self.longest_losing_streak = 0
+        self.sides: Dict[str, SideStats] = {"LONG": SideStats(), "SHORT": SideStats()}
+
+    def record(self, net: float, side: str = None) -> None:
+        super().record(net)
+        if side is not None:
+            side_stats = self.sides.get(side)
+            if side_stats is None:
+                side_stats = self.sides[side] = SideStats()
+            side_stats.record(net)
+
+        self.equity += net
+        if self.equity > self.peak_equity:
+            self.peak_equity = self.equity
+        elif self.peak_equity - self.equity > self.max_drawdown:
+            self.max_drawdown = self.peak_equity - self.equity
+
+        if net < 0:
+            self.losing_streak += 1
+            if self.losing_streak > self.longest_losing_streak:
+                self.longest_losing_streak = self.losing_streak
+        elif net > 0:
+            self.losing_streak = 0
+
+    @property
+    def net(self) -> float:
+        return self.equity
+
+    def to_state(self) -> Dict:
+        state = super().to_state()
+        for name in ("equity", "peak_equity", "max_drawdown", "losing_streak", "longest_losing_streak"):
+            state[name] = getattr(self, name)
+        state["sides"] = {side: side_stats.to_state() for side, side_stats in self.sides.items()}
+        return state
+
+    def load_state(self, state: Dict) -> None:
+        super().load_state(state)
+        for name in ("equity", "peak_equity", "max_drawdown", "losing_streak", "longest_losing_streak"):
+            setattr(self, name, state[name])
+        for side, side_state in state["sides"].items():
+            side_stats = self.sides.get(side)
+            if side_stats is None:
+                side_stats = self.sides[side] = SideStats()
+            side_stats.load_state(side_state)
+
+    def rows(self) -> List[List]:
+        """Metric/value rows for the summary table."""
+        rows = [
+            ["Number of Profits", self.wins],
+            ["Number of Losses", self.losses],
+            ["Total Net Result", self.equity],
+            ["Win Rate %", round(self.win_rate, 1)],
+            ["Average Win", round(self.avg_win, 2)],
+            ["Average Loss", round(self.avg_loss, 2)],
+            ["Expectancy", round(self.expectancy, 2)],
+            ["Max Drawdown", self.max_drawdown],
+            ["Longest Losing Streak", self.longest_losing_streak],
+        ]
+        for side, side_stats in self.sides.items():
+            rows.append([f"{side} Trades / Wins / Net", f"{side_stats.trades} / {side_stats.wins} / {side_stats.net}"])
+        return rows
@@ -0,0 +1,132 @@
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+from tabulate import tabulate
+
+from tickr.core.hotlog import configure_logging
+from tickr.core.tickcache import load_ticks
+from tickr.strategies.fibonacci.vectorized import VectorizedBacktest
+from utilities.helper import TICK_TO_POINT
+
+# Tick arrays of the current worker, read from the memory-mapped tick cache
+_timestamps: Optional[np.ndarray] = None
+_prices: Optional[np.ndarray] = None
+
+
+def parse_range(value: str) -> List[float]:
+    """Parse 'start:stop:step' (inclusive), 'a,b,c' or a single number into a list of values."""
+    value = value.strip()
+    if ":" in value:
+        start, stop, step = (float(part) for part in value.split(":"))
+        if step <= 0:
+            raise ValueError(f"Step must be positive in range '{value}'")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 10) for i in range(max(count, 0))]
+    return [float(part) for part in value.split(",") if part.strip()]
+
+
+def parse_tick_range(value: str, ticks_per_point: int) -> List[float]:
+    """parse_range for distances in points (TP/SL); every value must be a whole number of ticks."""
+    values = []
+    for points in parse_range(value):
+        ticks = int(round(points * ticks_per_point))
+        if abs(points * ticks_per_point - ticks) > 1e-6:
+            raise ValueError(f"{points:g} is not a whole number of ticks (1/{ticks_per_point} point)")
+        values.append(int(points) if points.is_integer() else points)
+    return values
+
+
+def _init_worker(filepath: str, ticks_per_point: int):
+    global _timestamps, _prices
+    configure_logging("ERROR")
+    ticks = load_ticks(filepath, ticks_per_point)
+    _timestamps = ticks.timestamps_us()
+    _prices = ticks.prices
+
+
+def _run_combination(params: Dict) -> Dict:
+    # Imported here so the worker only pays for the bot module once it has work
+    from tickr.strategies.fibonacci.run import FibonacciTradingBot
+
+    bot = FibonacciTradingBot(
+        point_a=params["point_a"],
+        point_b=params["point_b"],
+        instrument=params["instrument"],
+        quantity=params["quantity"],
+        take_profit=params["take_profit"],
+        stop_loss=params["stop_loss"],
+        reactivation_distance=params["reactivation_distance"],
+        nt_account="SWEEP",
+        price_stream_channel="SWEEP",
+        fibonacci_ratios=params["fibonacci_ratios"],
+        is_backtest=True,
+        profit_threshold=params["profit_threshold"],
+        loss_threshold=params["loss_threshold"],
+        quiet=True,
+    )
+    VectorizedBacktest(bot, _timestamps, _prices).run()
+
+    stats = bot.stats
+    return {
+        **params,
+        "trades": stats.trades,
+        "wins": stats.wins,
+        "losses": stats.losses,
+        "win_rate": stats.win_rate,
+        "total_pnl": stats.equity,
+        "max_drawdown": stats.max_drawdown,
+    }
+
+
+def run_sweep(
+    filepath: str,
+    grid: Dict[str, List],
+    fixed: Dict,
+    workers: Optional[int] = None,
+) -> List[Dict]:
+    """Backtest every combination of `grid` in a process pool and return results ranked by P&L.
+
+    The tick file is converted to the binary tick cache once; workers memory-map the same read-only files.
+    """
+    ticks_per_point = TICK_TO_POINT[fixed["instrument"].split(" ")[0]]
+    load_ticks(filepath, ticks_per_point)
+    names = list(grid)
+    combinations = [
+        {**fixed, **dict(zip(names, values))}
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(filepath, ticks_per_point)) as executor:
+        chunksize = max(1, len(combinations) // ((workers or os.cpu_count() or 1) * 4))
+        results = list(executor.map(_run_combination, combinations, chunksize=chunksize))
+
+    return sorted(results, key=lambda result: result["total_pnl"], reverse=True)
+
+
+def print_sweep_table(results: List[Dict], top: Optional[int] = None) -> None:
+    """Prints the ranked sweep results."""
+    headers = ["Rank", "Point A", "Point B", "TP", "SL", "Reactivation", "Ratios",
+               "Trades", "Wins", "Losses", "Win Rate %", "Total P&L", "Max DD"]
+    table_data = []
+    for rank, result in enumerate(results[:top] if top else results, start=1):
+        table_data.append([
+            rank,
+            result["point_a"],
+            result["point_b"],
+            result["take_profit"],
+            result["stop_loss"],
+            result["reactivation_distance"],
+            json.dumps(result["fibonacci_ratios"]),
+            result["trades"],
+            result["wins"],
+            result["losses"],
+            round(result["win_rate"], 1),
+            result["total_pnl"],
+            result["max_drawdown"],
+        ])
+
+    print(tabulate(table_data, headers=headers, tablefmt="simple_grid"))
@@ -0,0 +1,80 @@
+import heapq
+from math import inf
+from typing import Dict, List, Tuple
+
+
+class TriggerBook:
+    """Take-profit / stop-loss thresholds of open positions kept in price heaps.
+
+    Thresholds hit by a rising price (long TP, short SL) live in a min-heap and
+    thresholds hit by a falling price (long SL, short TP) in a max-heap, so a tick
+    only pops the positions it actually crossed. Removal is O(1): closed positions
+    are dropped from the live map and their stale heap entries skipped lazily.
+    Thresholds are integer instrument ticks.
+    """
+
+    def __init__(self):
+        self._upper: List[Tuple[int, int, str, str]] = []  # (price, seq, position id, outcome)
+        self._lower: List[Tuple[int, int, str, str]] = []  # (-price, seq, position id, outcome)
+        self._live: Dict[str, int] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def add(self, position_id: str, position_type: str, take_profit: int, stop_loss: int) -> None:
+        self._seq += 1
+        self._live[position_id] = self._seq
+        if position_type == "LONG":
+            heapq.heappush(self._upper, (take_profit, self._seq, position_id, "PROFIT"))
+            heapq.heappush(self._lower, (-stop_loss, self._seq, position_id, "LOSS"))
+        else:
+            heapq.heappush(self._upper, (stop_loss, self._seq, position_id, "LOSS"))
+            heapq.heappush(self._lower, (-take_profit, self._seq, position_id, "PROFIT"))
+
+    def remove(self, position_id: str) -> None:
+        self._live.pop(position_id, None)
+        # Stale entries are normally popped lazily; compact if they pile up on one side
+        if len(self._upper) + len(self._lower) > 4 * len(self._live) + 64:
+            self._upper = [entry for entry in self._upper if self._is_live(entry)]
+            self._lower = [entry for entry in self._lower if self._is_live(entry)]
+            heapq.heapify(self._upper)
+            heapq.heapify(self._lower)
+
+    def clear(self) -> None:
+        self._upper.clear()
+        self._lower.clear()
+        self._live.clear()
+
+    def _is_live(self, entry: Tuple[int, int, str, str]) -> bool:
+        return self._live.get(entry[2]) == entry[1]
+
+    def triggered(self, high: int, low: int) -> List[Tuple[str, str]]:
+        """(position id, outcome) for every position whose TP or SL lies at/below `high` or at/above `low`.
+
+        Results are in position opening order and a position hit on both sides reports PROFIT,
+        matching the original scan that checked take profit before stop loss.
+        """
+        hits: Dict[str, Tuple[int, str]] = {}
+        upper, lower = self._upper, self._lower
+        while upper and upper[0][0] <= high:
+            entry = heapq.heappop(upper)
+            if self._is_live(entry):
+                hits[entry[2]] = (entry[1], entry[3])
+        while lower and -lower[0][0] >= low:
+            entry = heapq.heappop(lower)
+            if self._is_live(entry) and hits.get(entry[2], (0, ""))[1] != "PROFIT":
+                hits[entry[2]] = (entry[1], entry[3])
+
+        if not hits:
+            return []
+        return [(position_id, outcome) for position_id, (_, outcome) in sorted(hits.items(), key=lambda item: item[1][0])]
+
+    def bounds(self) -> Tuple[float, float]:
+        """Nearest live thresholds above and below (inf/-inf when there is none)."""
+        upper, lower = self._upper, self._lower
+        while upper and not self._is_live(upper[0]):
+            heapq.heappop(upper)
+        while lower and not self._is_live(lower[0]):
+            heapq.heappop(lower)
+        return (upper[0][0] if upper else inf), (-lower[0][0] if lower else -inf)
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from tickr.core.tickcache import load_ticks
+from tickr.strategies.fibonacci.config import TradingSchedule
+from utilities.helper import TICK_TO_POINT
+
+
+def trading_window_mask(timestamps: np.ndarray, schedule: TradingSchedule) -> np.ndarray:
+    """Vectorized equivalent of `schedule.is_open` for every tick."""
+    if not timestamps.shape[0]:
+        return np.zeros(0, dtype=bool)
+    first_day = timestamps.min().astype("datetime64[D]").item()
+    last_day = timestamps.max().astype("datetime64[D]").item()
+    sessions = schedule.sessions(first_day, last_day + timedelta(days=1))
+    boundaries = np.array([edge for session in sessions for edge in session], dtype="datetime64[us]")
+    # Sessions are half-open [open, close): an odd insertion point means the tick is inside one
+    return np.searchsorted(boundaries, timestamps, side="right") % 2 == 1
+
+
+class VectorizedBacktest:
+    """Event-driven backtest over a whole session of tick arrays.
+
+    The strategy state only changes on ticks where a pending order is crossed, an
+    open position touches its TP/SL, an inactive level leaves the reactivation band
+    or the trading window opens/closes. Those ticks are located with vectorized
+    searches over per-block min/max arrays, and only they are fed to the bot's own
+    `process_tick`, so the resulting trade list is identical to the scalar engine.
+    Prices are integer instrument ticks, as stored in the tick cache.
+    """
+
+    BLOCK_SIZE = 512
+    # Thresholds are clamped to the price dtype so searches never upcast the tick arrays
+    NO_UPPER = np.iinfo(np.int32).max
+    NO_LOWER = np.iinfo(np.int32).min
+
+    def __init__(self, bot, timestamps: np.ndarray, prices: np.ndarray):
+        self.bot = bot
+        self.timestamps = timestamps.astype("datetime64[us]", copy=False)
+        self.prices = prices.astype(np.int32, copy=False)
+        self.size = prices.shape[0]
+
+        # Per-block extremes; the tail is padded with the last price so it never adds a hit
+        padding = (-self.size) % self.BLOCK_SIZE if self.size else 0
+        blocks = np.pad(self.prices, (0, padding), mode="edge").reshape(-1, self.BLOCK_SIZE)
+        self.block_max = blocks.max(axis=1, initial=self.NO_LOWER)
+        self.block_min = blocks.min(axis=1, initial=self.NO_UPPER)
+
+        in_window = trading_window_mask(self.timestamps, bot.trading_schedule)
+        self.window_edges = np.flatnonzero(in_window[1:] != in_window[:-1]) + 1
+
+    @classmethod
+    def from_file(cls, bot, path: str) -> "VectorizedBacktest":
+        ticks = load_ticks(path, TICK_TO_POINT[bot.INSTRUMENT.split(" ")[0]])
+        return cls(bot, ticks.timestamps_us(), ticks.prices)
+
+    def first_touch(self, start: int, upper: int, lower: int) -> int:
+        """Index of the first tick at/after `start` with price >= upper or price <= lower."""
+        prices, size, block = self.prices, self.size, self.BLOCK_SIZE
+        if start >= size:
+            return size
+
+        first_block = start // block
+        segment = prices[start:min((first_block + 1) * block, size)]
+        hits = np.flatnonzero((segment >= upper) | (segment <= lower))
+        if hits.size:
+            return start + int(hits[0])
+
+        # Scan block summaries in growing windows so close events stay cheap
+        current, span, num_blocks = first_block + 1, 64, self.block_max.shape[0]
+        while current < num_blocks:
+            stop = min(current + span, num_blocks)
+            hit_blocks = np.flatnonzero((self.block_max[current:stop] >= upper) | (self.block_min[current:stop] <= lower))
+            if hit_blocks.size:
+                base = (current + int(hit_blocks[0])) * block
+                segment = prices[base:min(base + block, size)]
+                return base + int(np.flatnonzero((segment >= upper) | (segment <= lower))[0])
+            current, span = stop, span * 2
+        return size
+
+    def next_event(self, index: int) -> int:
+        """First tick after `index` that can change the strategy state."""
+        bot = self.bot
+        price = int(self.prices[index])
+
+        # Pending orders fill as soon as the price reaches them from either side
+        lower, upper = bot.level_index.nearest_pending(price)
+        if lower == price:
+            return index + 1
+
+        # Inactive levels reactivate once the price leaves their band
+        lowest, highest = bot.level_index.inactive_bounds()
+        upper = min(upper, lowest + bot.REACTIVATION_TICKS)
+        lower = max(lower, highest - bot.REACTIVATION_TICKS)
+
+        # Open positions close once the price reaches their nearest TP/SL
+        nearest_upper, nearest_lower = bot.trigger_book.bounds()
+        upper = int(min(upper, nearest_upper, self.NO_UPPER))
+        lower = int(max(lower, nearest_lower, self.NO_LOWER))
+
+        next_touch = self.first_touch(index + 1, upper, lower)
+        edge = np.searchsorted(self.window_edges, index, side="right")
+        if edge < self.window_edges.shape[0]:
+            return min(next_touch, int(self.window_edges[edge]))
+        return next_touch
+
+    def tick_timestamp(self, index: int) -> datetime:
+        return self.timestamps[index].item()
+
+    def run(self):
+        bot, prices = self.bot, self.prices
+        if not self.size:
+            return
+        bot.process_tick(int(prices[0]), tick_timestamp=self.tick_timestamp(0))
+
+        index = 0
+        while not bot.threshold_reached:
+            index = self.next_event(index)
+            if index >= self.size:
+                break
+            bot.last_tick = int(prices[index - 1])
+            bot.process_tick(int(prices[index]), tick_timestamp=self.tick_timestamp(index))
+        if not bot.threshold_reached:
+            bot.last_tick = int(prices[-1])
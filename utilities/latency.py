@@ -0,0 +1,172 @@
+"""Low-overhead latency histograms for the tick-to-order path.
+
+Durations are taken with `time.monotonic_ns()` and recorded into log-linear
+(HDR-style) histograms: 64 linear sub-buckets per power of two, so every value is
+kept within ~1.5% using a few hundred integer counters per stage. Recording is a
+couple of integer operations, cheap enough to leave on in production; set
+TICKR_LATENCY=0 to switch it off.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from tabulate import tabulate
+
+SUB_BUCKET_BITS = 7
+_SUB_BUCKET_HALF_BITS = SUB_BUCKET_BITS - 1
+
+now_ns = time.monotonic_ns
+
+
+def _bucket_bounds(index: int):
+    shift = max((index >> _SUB_BUCKET_HALF_BITS) - 1, 0)
+    low = (index - (shift << _SUB_BUCKET_HALF_BITS)) << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    __slots__ = ("name", "counts", "count", "total", "max")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: List[int] = [0] * (2 << SUB_BUCKET_BITS)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int) -> None:
+        """Record a non-negative duration (monotonic clock differences always are)."""
+        shift = value_ns.bit_length() - SUB_BUCKET_BITS
+        index = (shift << _SUB_BUCKET_HALF_BITS) + (value_ns >> shift) if shift > 0 else value_ns
+        try:
+            self.counts[index] += 1
+        except IndexError:
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+            self.counts[index] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, percent: float) -> int:
+        """Upper bound of the bucket holding the given percentile (capped at the exact max)."""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        self.counts = [0] * (2 << SUB_BUCKET_BITS)
+        self.count = self.total = self.max = 0
+
+
+def _format_ns(value: float) -> str:
+    if value < 1_000:
+        return f"{value:.0f}ns"
+    if value < 1_000_000:
+        return f"{value / 1_000:.1f}us"
+    return f"{value / 1_000_000:.2f}ms"
+
+
+class LatencyTracker:
+    """Per-stage histograms plus the stamps linking a tick to the orders it triggers.
+
+    `tick_received_ns` is set (tick thread) when a price message arrives and
+    `order_started()` stamps the strategy deciding to place an order. The order
+    gateway thread copies both stamps of the order it is about to send into
+    `order_sending()`. The client takes them with `order_queued()` when it queues
+    the command and reports them to `order_written()` once the bytes have been
+    written to the NinjaTrader socket, which may be later when writes are batched.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.tick_received_ns = 0
+        self.order_started_ns = 0
+        self.order_tick_ns = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram(stage)
+        return histogram
+
+    def record(self, stage: str, started_ns: int, ended_ns: int = 0) -> None:
+        if self.enabled:
+            self.histogram(stage).record((ended_ns or now_ns()) - started_ns)
+
+    def order_started(self) -> int:
+        """Stamp the start of an order placement; returns the stamp (0 when disabled)."""
+        if not self.enabled:
+            return 0
+        started = now_ns()
+        if self.tick_received_ns:
+            self.histogram("tick_to_order").record(started - self.tick_received_ns)
+        return started
+
+    def order_sending(self, started_ns: int, tick_ns: int) -> None:
+        """Stamps of the order about to be written (called by the thread that sends it)."""
+        self.order_started_ns = started_ns
+        self.order_tick_ns = tick_ns
+
+    def order_queued(self) -> Optional[Tuple[int, int]]:
+        """Take the stamps of the order being queued on the socket (None when there are none)."""
+        if not (self.enabled and self.order_started_ns):
+            return None
+        stamps = (self.order_started_ns, self.order_tick_ns)
+        self.order_started_ns = self.order_tick_ns = 0
+        return stamps
+
+    def order_written(self, stamps: Tuple[int, int]) -> None:
+        """Close the stamps taken by `order_queued()` once the command is on the wire."""
+        written = now_ns()
+        started_ns, tick_ns = stamps
+        self.histogram("order_to_send").record(written - started_ns)
+        if tick_ns:
+            self.histogram("tick_to_send").record(written - tick_ns)
+
+    def rows(self) -> List[List]:
+        return [
+            [stage, h.count, _format_ns(h.mean), _format_ns(h.percentile(50)), _format_ns(h.percentile(90)),
+             _format_ns(h.percentile(99)), _format_ns(h.percentile(99.9)), _format_ns(h.max)]
+            for stage, h in self.histograms.items() if h.count
+        ]
+
+    def report(self) -> str:
+        headers = ["Stage", "Count", "Mean", "p50", "p90", "p99", "p99.9", "Max"]
+        return tabulate(self.rows(), headers=headers, tablefmt="simple_grid")
+
+    def start_periodic_report(self, interval: float, emit) -> None:
+        """Call `emit(report)` every `interval` seconds from a daemon timer until `stop_periodic_report`."""
+        def tick():
+            if self.rows():
+                emit(self.report())
+            self.start_periodic_report(interval, emit)
+
+        self._timer = threading.Timer(interval, tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop_periodic_report(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def reset(self) -> None:
+        self.histograms.clear()
+        self.tick_received_ns = self.order_started_ns = self.order_tick_ns = 0
+
+
+LATENCY = LatencyTracker(enabled=os.getenv("TICKR_LATENCY", "1") != "0")